@@ -0,0 +1,73 @@
+# benchmarks/delivery_memory.py
+"""Memory and query cost of the columnar ball log for a whole season.
+
+Usage:
+    python benchmarks/delivery_memory.py [matches] [deliveries_per_match]
+
+Builds `matches` DeliveryStores of random deliveries (74 T20 matches of
+~250 deliveries by default, one IPL season) and the same data as lists of
+Delivery namedtuples, the previous format, and reports traced memory per
+delivery for each. Also times the two queries the app needs: the last 18
+balls for display and per-over run totals.
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delivery_rules import OUTCOMES  # noqa: E402
+from delivery_store import Delivery, DeliveryStore  # noqa: E402
+
+
+def random_match(rng, deliveries):
+    start = time.time()
+    outcomes = list(OUTCOMES)
+    rows = []
+    for i in range(deliveries):
+        outcome = OUTCOMES[rng.choice(outcomes)]
+        rows.append(Delivery(outcome.gesture, outcome.symbol, outcome.runs, outcome.legal, outcome.wicket,
+                             1 if i < deliveries // 2 else 2, start + i * 35.0, False))
+    return rows
+
+
+def traced(build):
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    matches = int(sys.argv[1]) if len(sys.argv) > 1 else 74
+    per_match = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    rng = random.Random(0)
+    season = [random_match(rng, per_match) for _ in range(matches)]
+    total = matches * per_match
+
+    # Rows are rebuilt inside the trace so each format pays for its own objects
+    _, list_bytes = traced(lambda: [[Delivery(*row) for row in match] for match in season])
+    stores, store_bytes = traced(lambda: [DeliveryStore(match) for match in season])
+    print(f"{matches} matches, {total} deliveries")
+    print(f"  list of Delivery  {list_bytes / 1024:9.1f} KiB  {list_bytes / total:6.1f} bytes/delivery")
+    print(f"  DeliveryStore     {store_bytes / 1024:9.1f} KiB  {store_bytes / total:6.1f} bytes/delivery "
+          f"({sum(s.nbytes() for s in stores) / total:.0f} in the columns)")
+
+    store = stores[0]
+    repeats = 2000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        store.symbols(len(store) - 18)
+    last18 = (time.perf_counter() - start) / repeats * 1e6
+    start = time.perf_counter()
+    for _ in range(repeats // 10):
+        store.over_runs(1)
+    overs = (time.perf_counter() - start) / (repeats // 10) * 1e6
+    print(f"  last 18 balls {last18:7.1f} us, per-over runs {overs:7.1f} us ({per_match} deliveries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# benchmarks/frame_allocations.py
+"""Per-frame memory allocations on the capture -> inference -> draw path.
+
+Usage:
+    python benchmarks/frame_allocations.py [frames] [--width W --height H]
+
+Runs the same synthetic frames through two loops under tracemalloc:
+
+  copying  the old loop - cv2.flip and cv2.cvtColor returning new arrays,
+           and a copy of every frame handed to inference so it can be drawn on
+  ring     the current loop - flip into a reused buffer, frames for
+           inference copied into a SharedFrameRing slot and read in place,
+           colour conversion into HandRoi's reused buffers
+
+MediaPipe is replaced by a stub that finds no hand, so only the frame
+handling is measured. For each loop it prints the largest extra memory one
+frame needed on top of what was live before it (tracemalloc peak), and how
+much live memory grew over the measured frames. Exits 1 if a frame of the
+ring loop allocated more than MAX_RING_BYTES, far less than any frame or
+hand crop.
+
+Without OpenCV or MediaPipe only the frame ring itself is checked: frames
+are flipped with NumPy into the reused buffer, go through the ring and are
+read in place, with no pipeline. That part runs anywhere NumPy does, e.g.
+in CI.
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_ring import SharedFrameRing  # noqa: E402
+
+try:
+    import cv2
+    from gesture_pipeline import GesturePipeline
+    PIPELINE_AVAILABLE = True
+except (ImportError, AttributeError):  # AttributeError: a MediaPipe build without mp.solutions
+    PIPELINE_AVAILABLE = False
+
+MAX_RING_BYTES = 16 * 1024  # Per-frame allocations allowed in the ring loop; a 640x480 frame is 900 KiB
+
+
+class NoHands:
+    """Stands in for mp.solutions.hands.Hands; never finds a hand"""
+    multi_hand_landmarks = None
+
+    def process(self, image_rgb):
+        return self
+
+    def close(self):
+        pass
+
+
+def make_pipeline():
+    pipeline = GesturePipeline(on_confirm=lambda gesture: None, on_reset=lambda: None)
+    pipeline.close()
+    pipeline.hands = pipeline.scan_hands = NoHands()
+    return pipeline
+
+
+def copying_loop(frames):
+    """The loop before the frame ring, one generator step per frame"""
+    pipeline = make_pipeline()
+    hands = pipeline.hands
+    for i, frame in enumerate(frames):
+        image_bgr = cv2.flip(frame, 1)
+        submitted = image_bgr
+        image_bgr = image_bgr.copy()  # Worker owns the submitted frame
+        hands.process(cv2.cvtColor(submitted, cv2.COLOR_BGR2RGB))
+        pipeline.infer(submitted, float(i))
+        pipeline.draw(image_bgr)
+        yield
+
+
+def ring_loop(frames):
+    """The current loop: reused buffers and a frame ring read in place"""
+    pipeline = make_pipeline()
+    ring = SharedFrameRing(frames[0].shape)
+    image_bgr = np.empty_like(frames[0])
+    last_seq = 0
+    try:
+        for frame in frames:
+            cv2.flip(frame, 1, dst=image_bgr)
+            slot, ring_frame = ring.write_slot()
+            np.copyto(ring_frame, image_bgr)
+            ring.publish(slot)
+            # What an inference worker does with the ring
+            slot, last_seq, stamp, view = ring.read_latest(last_seq)
+            try:
+                pipeline.infer(view, stamp)
+            finally:
+                ring.release()
+            pipeline.draw(image_bgr)
+            yield
+    finally:
+        ring.close()
+
+
+def ring_only_loop(frames):
+    """The ring loop without OpenCV or the pipeline: flip, write a slot, read it in place"""
+    ring = SharedFrameRing(frames[0].shape)
+    image_bgr = np.empty_like(frames[0])
+    last_seq = 0
+    try:
+        for frame in frames:
+            np.copyto(image_bgr, frame[:, ::-1])
+            slot, ring_frame = ring.write_slot()
+            np.copyto(ring_frame, image_bgr)
+            ring.publish(slot)
+            slot, last_seq, stamp, view = ring.read_latest(last_seq)
+            try:
+                image_bgr[:1] = view[:1]  # Touch the view like a reader would
+            finally:
+                ring.release()
+            yield
+    finally:
+        ring.close()
+
+
+def measure(loop, frames, warmup):
+    """Returns (largest per-frame transient bytes, live bytes grown) after `warmup` frames"""
+    steps = loop(frames)
+    tracemalloc.start()
+    for _ in range(warmup):
+        next(steps)
+    start, _ = tracemalloc.get_traced_memory()
+    worst = 0
+    for _ in range(len(frames) - warmup):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        next(steps)
+        _, peak = tracemalloc.get_traced_memory()
+        worst = max(worst, peak - before)
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    steps.close()
+    return worst, end - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("frames", type=int, nargs="?", default=200)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8) for _ in range(4)]
+    frames = [frames[i % len(frames)] for i in range(args.frames)]
+    frame_bytes = frames[0].nbytes
+    warmup = min(20, args.frames // 2)
+
+    print(f"{args.frames} frames of {args.width}x{args.height} ({frame_bytes / 1024:.0f} KiB), {warmup} warm-up")
+    results = {}
+    if PIPELINE_AVAILABLE:
+        loops = (("copying", copying_loop), ("ring", ring_loop))
+    else:
+        print("  OpenCV/MediaPipe not available - checking the frame ring alone")
+        loops = (("ring", ring_only_loop),)
+    for name, loop in loops:
+        worst, grown = measure(loop, frames, warmup)
+        results[name] = worst
+        print(f"  {name:8s} per-frame peak {worst / 1024:9.1f} KiB ({worst / frame_bytes:4.1f} frames), "
+              f"live growth {grown / 1024:8.1f} KiB")
+
+    if results["ring"] > MAX_RING_BYTES:
+        print(f"FAIL: the ring loop allocated {results['ring'] / 1024:.1f} KiB in one frame, "
+              f"over the {MAX_RING_BYTES // 1024} KiB budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
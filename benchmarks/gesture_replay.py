@@ -0,0 +1,187 @@
+# benchmarks/gesture_replay.py
+"""Replay recorded landmark sequences through the classifier and hold-to-confirm logic.
+
+Usage:
+    python benchmarks/gesture_replay.py [fixture.npz ...] [--confirmer vote|hold] [--delay S]
+                                        [--window S] [--majority F] [--tolerance 0.5]
+                                        [--min-fps N] [--min-accuracy 0.9] [--max-false N]
+
+No camera, GPU, MediaPipe or Streamlit: each fixture is a .npz with
+    landmarks     (T, 21, 3) normalized hand landmarks (zeros where no hand)
+    timestamps    (T,) seconds
+    present       (T,) bool, False where MediaPipe found no hand
+    event_times   (E,) when each labelled signal should confirm
+    event_labels  (E,) the gesture scored ("0".."5", "wide", "no_ball", ...)
+    event_spans   (E, 2) optional, when each signal was shown and taken down
+and defaults to every file in benchmarks/fixtures. Frames go through the
+same per-frame path as GesturePipeline (landmark list -> array ->
+classify_landmarks -> VoteConfirmer; --classifier model swaps in the learned
+gesture_model, whose probability then weights each vote, and --confirmer hold
+the strict HoldConfirmer).
+A confirmation counts as correct when its label matches an unclaimed event
+while that signal was shown (up to --tolerance seconds after), or, for
+fixtures without spans, within --tolerance seconds of the event time; the
+latency from showing a signal to scoring it is reported where spans are
+known. Any --min/--max threshold that is missed makes the script exit with
+status 1, for CI.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_confirmation import HoldConfirmer, VoteConfirmer  # noqa: E402
+from gesture_model import load_model  # noqa: E402
+from landmark_classifier import classify_batch, classify_landmarks, landmarks_to_array  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixture(path):
+    data = np.load(path)
+    return {key: data[key] for key in data.files}
+
+
+def as_hand_landmarks(points):
+    """Wrap a (21, 3) array in the shape of a MediaPipe landmark list"""
+    return SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in points])
+
+
+def percentiles(samples_ns):
+    values = np.array(samples_ns, dtype=np.float64) / 1000.0  # microseconds
+    if not len(values):
+        return "-"
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return f"p50 {p50:7.2f}  p95 {p95:7.2f}  p99 {p99:7.2f}  us"
+
+
+def replay(fixture, confirmer, classify=classify_landmarks, confidence=None):
+    """Run one fixture frame by frame; returns (confirmed events, per-stage timings in ns)"""
+    landmarks = fixture["landmarks"].astype(np.float32)
+    hands = [as_hand_landmarks(points) if present else None
+             for points, present in zip(landmarks, fixture["present"])]
+    stages = {"to_array": [], "classify": [], "confirm": [], "frame": []}
+    confirmed = []
+    buffer = np.empty((21, 3), dtype=np.float32)
+    clock = time.perf_counter_ns
+
+    for hand, now in zip(hands, fixture["timestamps"]):
+        start = clock()
+        if hand is None:
+            confirmer.no_hand(float(now))
+            stages["frame"].append(clock() - start)
+            continue
+        points = landmarks_to_array(hand, out=buffer)
+        converted = clock()
+        special, fingers = classify(points)
+        weight = confidence(points) if confidence is not None else 1.0
+        classified = clock()
+        status = confirmer.update(special if special else fingers, float(now), weight)
+        done = clock()
+        if status.action is not None:
+            confirmed.append((float(now), str(status.action)))
+        stages["to_array"].append(converted - start)
+        stages["classify"].append(classified - converted)
+        stages["confirm"].append(done - classified)
+        stages["frame"].append(done - start)
+    return confirmed, stages
+
+
+def score_events(confirmed, fixture, tolerance):
+    """Match confirmations to labelled events; returns (correct, false confirmations, latencies)"""
+    event_times, event_labels = fixture["event_times"], fixture["event_labels"]
+    spans = fixture.get("event_spans")
+    claimed = np.zeros(len(event_times), dtype=bool)
+    correct = 0
+    latencies = []
+    for when, label in confirmed:
+        if spans is not None:
+            in_time = (spans[:, 0] <= when) & (when <= spans[:, 1] + tolerance)
+        else:
+            in_time = np.abs(event_times - when) <= tolerance
+        candidates = np.flatnonzero(~claimed & (event_labels == label) & in_time)
+        if len(candidates):
+            claimed[candidates[0]] = True
+            correct += 1
+            if spans is not None:
+                latencies.append(when - spans[candidates[0], 0])
+    return correct, len(confirmed) - correct, latencies
+
+
+def batch_fps(landmarks, batch=classify_batch, repeats=20):
+    """Hands per second through a classify_batch for a whole fixture at once"""
+    points = landmarks.astype(np.float32)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        batch(points)
+    return len(points) * repeats / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fixtures", nargs="*")
+    parser.add_argument("--classifier", choices=("rules", "model"), default="rules")
+    parser.add_argument("--confirmer", choices=("vote", "hold"), default="vote")
+    parser.add_argument("--delay", type=float, default=None, help="Hold time before a gesture confirms")
+    parser.add_argument("--window", type=float, default=0.6, help="Seconds of frames that vote (vote only)")
+    parser.add_argument("--majority", type=float, default=0.6, help="Vote share a gesture needs (vote only)")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Seconds a confirmation may be off its label")
+    parser.add_argument("--min-fps", type=float, default=None)
+    parser.add_argument("--min-accuracy", type=float, default=None)
+    parser.add_argument("--max-false", type=int, default=None)
+    args = parser.parse_args()
+
+    paths = args.fixtures or sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.npz")))
+    if not paths:
+        sys.exit("No fixtures found; run benchmarks/make_replay_fixtures.py first")
+
+    classify, batch, confidence = classify_landmarks, classify_batch, None
+    if args.classifier == "model":
+        model = load_model()
+        classify, batch, confidence = model.classify_landmarks, model.classify_batch, model.confidence
+
+    failed = False
+    for path in paths:
+        fixture = load_fixture(path)
+        frames = len(fixture["timestamps"])
+        if args.confirmer == "hold":
+            confirmer = HoldConfirmer(delay=5.0 if args.delay is None else args.delay)
+        else:
+            confirmer = VoteConfirmer(delay=1.0 if args.delay is None else args.delay,
+                                      window=args.window, majority=args.majority)
+        confirmed, stages = replay(fixture, confirmer, classify, confidence)
+        correct, false, latencies = score_events(confirmed, fixture, args.tolerance)
+        events = len(fixture["event_labels"])
+        accuracy = correct / events if events else 1.0
+        fps = frames / (sum(stages["frame"]) / 1e9)
+
+        print(f"{os.path.basename(path)}: {frames} frames ({int(fixture['present'].sum())} with a hand), "
+              f"{fixture['timestamps'][-1]:.0f}s of play")
+        print(f"  per-frame path   {fps:12,.0f} frames/s")
+        print(f"  classify_batch   {batch_fps(fixture['landmarks'], batch):12,.0f} hands/s")
+        for stage in ("to_array", "classify", "confirm", "frame"):
+            print(f"  {stage:9s} {percentiles(stages[stage])}")
+        print(f"  confirmed {correct}/{events} events ({accuracy:.0%}), {false} false confirmations")
+        if latencies:
+            print(f"  latency from signal to score: median {np.median(latencies):.2f}s, max {max(latencies):.2f}s")
+
+        if args.min_fps is not None and fps < args.min_fps:
+            failed = True
+            print(f"  FAIL: {fps:.0f} frames/s < {args.min_fps:.0f}")
+        if args.min_accuracy is not None and accuracy < args.min_accuracy:
+            failed = True
+            print(f"  FAIL: accuracy {accuracy:.0%} < {args.min_accuracy:.0%}")
+        if args.max_false is not None and false > args.max_false:
+            failed = True
+            print(f"  FAIL: {false} false confirmations > {args.max_false}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
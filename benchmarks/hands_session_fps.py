@@ -0,0 +1,74 @@
+# benchmarks/hands_session_fps.py
+"""Compare per-frame Hands sessions against one persistent session.
+
+Usage:
+    python benchmarks/hands_session_fps.py [video_file_or_camera_index] [frames]
+
+Reads the same frames twice: once opening a new mp_hands.Hands context for
+every frame (the old VideoProcessor behaviour) and once through a single
+session kept open for the whole run, then prints frames per second for both
+and how many frames had a hand. Only frames with a hand exercise tracking;
+on frames without one, both modes run palm detection.
+"""
+import sys
+import time
+
+import cv2
+import mediapipe as mp
+
+mp_hands = mp.solutions.hands
+
+
+def read_frames(source, count):
+    """Read up to `count` RGB frames from a video file or camera index"""
+    cap = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    frames = []
+    while cap.isOpened() and len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    cap.release()
+    return frames
+
+
+def per_frame_sessions(frames):
+    start = time.perf_counter()
+    for frame in frames:
+        with mp_hands.Hands(min_detection_confidence=0.7,
+                            min_tracking_confidence=0.5,
+                            max_num_hands=1) as hands:
+            hands.process(frame)
+    return len(frames) / (time.perf_counter() - start)
+
+
+def persistent_session(frames):
+    """Returns (frames per second, frames with a hand found)"""
+    detected = 0
+    start = time.perf_counter()
+    with mp_hands.Hands(static_image_mode=False,
+                        min_detection_confidence=0.7,
+                        min_tracking_confidence=0.5,
+                        max_num_hands=1) as hands:
+        for frame in frames:
+            detected += hands.process(frame).multi_hand_landmarks is not None
+    return len(frames) / (time.perf_counter() - start), detected
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else "0"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    frames = read_frames(source, count)
+    if not frames:
+        print(f"No frames read from {source}")
+        return
+
+    before = per_frame_sessions(frames)
+    after, detected = persistent_session(frames)
+    print(f"Frames: {len(frames)} ({frames[0].shape[1]}x{frames[0].shape[0]}), hand found in {detected}")
+    print(f"Per-frame Hands session:  {before:6.1f} FPS")
+    print(f"Persistent Hands session: {after:6.1f} FPS ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/make_replay_fixtures.py
+"""Generate synthetic landmark fixtures for benchmarks/gesture_replay.py.
+
+Usage:
+    python benchmarks/make_replay_fixtures.py [output_dir]
+
+Builds umpire sessions from the hand poses of gesture_poses.py, which
+satisfy the classifier rules: each labelled signal is held long enough to
+confirm, with the hand leaving the frame in between, plus short distractor
+poses that must not score.
+"clean" only adds landmark jitter; "noisy" also drops frames and injects
+single-frame misdetections, like a real camera under stadium lighting;
+"tilted" holds each signal with the hand rotated up to 60 degrees.
+Fixtures from a real camera come from benchmarks/record_landmarks.py.
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_poses import POSES, rotate  # noqa: E402
+
+FPS = 15  # Roughly what the inference scheduler runs MediaPipe at
+HOLD = 5.0  # How long a signal is held before it counts (the old controller delay)
+DISTRACTOR_MIN, DISTRACTOR_MAX = 0.3, 0.8  # Seconds a passing pose is shown, well under the 1s confirmation
+
+SEQUENCE = ["1", "4", "wide", "0", "2", "no_ball", "5", "dot_ball", "3", "1", "wide", "4"]
+
+
+def build_session(rng, noise=0.004, drop_rate=0.0, glitch_rate=0.0, tilt=0.0):
+    """Return the fixture arrays for one umpire session"""
+    labels = list(POSES)
+    frames, times, present, event_times, event_labels, event_spans = [], [], [], [], [], []
+    t = 0.0
+
+    def emit(pose, seconds):
+        nonlocal t
+        angle = rng.uniform(-tilt, tilt) if tilt else 0.0
+        for _ in range(int(seconds * FPS)):
+            times.append(t)
+            if pose is None or rng.random() < drop_rate:
+                frames.append(np.zeros((21, 3), dtype=np.float32))
+                present.append(False)
+            else:
+                shown = POSES[labels[rng.integers(len(labels))]] if rng.random() < glitch_rate else POSES[pose]
+                offset = rng.normal(0, 0.02, size=(1, 3)) * (1, 1, 0)  # Whole hand drifts a little
+                if angle:
+                    shown = rotate(shown, angle)
+                frames.append(shown + offset + rng.normal(0, noise, size=(21, 3)))
+                present.append(True)
+            t += rng.uniform(0.8, 1.2) / FPS
+
+    for label in SEQUENCE:
+        emit(None, rng.uniform(1.0, 2.0))
+        if rng.random() < 0.5:
+            # Distractor: a different signal flashed too briefly to score
+            emit(labels[rng.integers(len(labels))], rng.uniform(DISTRACTOR_MIN, DISTRACTOR_MAX))
+            emit(None, 0.5)
+        start = t
+        emit(label, HOLD + 1.5)
+        event_times.append(start + HOLD)
+        event_labels.append(label)
+        event_spans.append((start, t))
+    emit(None, 1.0)
+    return frames, times, present, event_times, event_labels, event_spans
+
+
+def main():
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+    os.makedirs(out_dir, exist_ok=True)
+    for name, seed, kwargs in (("clean", 11, {}),
+                               ("noisy", 12, {"noise": 0.008, "drop_rate": 0.01, "glitch_rate": 0.01}),
+                               ("tilted", 13, {"tilt": 60.0})):
+        rng = np.random.default_rng(seed)
+        frames, times, present, event_times, event_labels, event_spans = build_session(rng, **kwargs)
+        path = os.path.join(out_dir, f"{name}.npz")
+        np.savez_compressed(path,
+                            landmarks=np.array(frames, dtype=np.float16),
+                            timestamps=np.array(times, dtype=np.float64),
+                            present=np.array(present, dtype=bool),
+                            event_times=np.array(event_times, dtype=np.float64),
+                            event_labels=np.array(event_labels),
+                            event_spans=np.array(event_spans, dtype=np.float64))
+        print(f"{path}: {len(frames)} frames, {len(event_labels)} events, {os.path.getsize(path) // 1024} KiB")
+
+
+if __name__ == "__main__":
+    main()
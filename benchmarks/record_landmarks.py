@@ -0,0 +1,75 @@
+# benchmarks/record_landmarks.py
+"""Record a camera session as a landmark fixture for benchmarks/gesture_replay.py.
+
+Usage:
+    python benchmarks/record_landmarks.py output.npz [camera_index]
+
+Runs MediaPipe on the camera and stores only the landmarks and timestamps.
+While recording, press the key of the signal you have just confirmed (0-5,
+w = wide, n = no ball, d = dot ball, b = bye) to label an event at that
+moment; press q to stop and save.
+"""
+import sys
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+mp_hands = mp.solutions.hands
+
+KEY_LABELS = {ord(str(n)): str(n) for n in range(6)}
+KEY_LABELS.update({ord("w"): "wide", ord("n"): "no_ball", ord("d"): "dot_ball", ord("b"): "bye"})
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    output = sys.argv[1]
+    cap = cv2.VideoCapture(int(sys.argv[2]) if len(sys.argv) > 2 else 0)
+
+    landmarks, timestamps, present = [], [], []
+    event_times, event_labels = [], []
+    start = time.time()
+    with mp_hands.Hands(min_detection_confidence=0.7,
+                        min_tracking_confidence=0.5,
+                        max_num_hands=1) as hands:
+        while cap.isOpened():
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame = cv2.flip(frame, 1)
+            results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            now = time.time() - start
+
+            points = np.zeros((21, 3), dtype=np.float32)
+            if results.multi_hand_landmarks:
+                points[:] = [(lm.x, lm.y, lm.z) for lm in results.multi_hand_landmarks[0].landmark]
+            landmarks.append(points)
+            timestamps.append(now)
+            present.append(bool(results.multi_hand_landmarks))
+
+            cv2.putText(frame, f"{now:6.1f}s  events: {len(event_labels)}", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            cv2.imshow("Record landmarks", frame)
+            key = cv2.waitKey(1) & 0xFF
+            if key == ord("q"):
+                break
+            if key in KEY_LABELS:
+                event_times.append(now)
+                event_labels.append(KEY_LABELS[key])
+                print(f"{now:6.1f}s  {KEY_LABELS[key]}")
+    cap.release()
+    cv2.destroyAllWindows()
+
+    np.savez_compressed(output,
+                        landmarks=np.array(landmarks, dtype=np.float16),
+                        timestamps=np.array(timestamps, dtype=np.float64),
+                        present=np.array(present, dtype=bool),
+                        event_times=np.array(event_times, dtype=np.float64),
+                        event_labels=np.array(event_labels))
+    print(f"Saved {len(landmarks)} frames and {len(event_labels)} events to {output}")
+
+
+if __name__ == "__main__":
+    main()
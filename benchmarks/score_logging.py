@@ -0,0 +1,85 @@
+# benchmarks/score_logging.py
+"""Per-delivery cost of score event logging over a 240-ball innings.
+
+Usage:
+    python benchmarks/score_logging.py [balls] [--output PATH] [--repeats N]
+
+Scores `balls` legal deliveries through ScoreEngine.update_score (cooldown
+off) with logging at WARNING (off), INFO through the queue (the default),
+DEBUG through the queue (state dump after every delivery) and DEBUG with a
+synchronous handler, which writes on the scoring thread like print() did.
+Records go to PATH (default os.devnull; pass a file or /dev/tty to include
+the cost of a real stream). Reports the mean time of update_score in
+blocks of 40 balls: a flat row means the cost does not grow with the
+match.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SCORE_JOURNAL_DIR", "")  # Keep the benchmark off the disk
+
+import score_log  # noqa: E402
+from score_state import ScoreEngine  # noqa: E402
+
+GESTURES = [1, 0, 4, 2, 5, "dot_ball", 3, 1, 2, "dot_ball"]  # Legal deliveries, no two alike in a row
+BLOCK = 40
+
+
+def innings(balls):
+    """update_score time of each delivery, in microseconds"""
+    engine = ScoreEngine(match_overs=balls // 6 + 1, cooldown_period=0.0)
+    times = []
+    for i in range(balls):
+        start = time.perf_counter()
+        engine.update_score(GESTURES[i % len(GESTURES)])
+        times.append((time.perf_counter() - start) * 1e6)
+        engine.reset_gesture_flag()
+    return times
+
+
+def synchronous(level, stream):
+    """Log straight to the stream on the scoring thread, without the queue"""
+    score_log.shutdown()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    score_log.logger.addHandler(handler)
+    score_log.logger.setLevel(level)
+    return lambda: score_log.logger.removeHandler(handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("balls", nargs="?", type=int, default=240)
+    parser.add_argument("--output", default=os.devnull)
+    parser.add_argument("--repeats", type=int, default=20, help="Innings per mode; the median time per ball is kept")
+    args = parser.parse_args()
+
+    stream = open(args.output, "w")
+    modes = [
+        ("off (WARNING)", lambda: score_log.configure("WARNING", stream)),
+        ("INFO, queued", lambda: score_log.configure("INFO", stream)),
+        ("DEBUG, queued", lambda: score_log.configure("DEBUG", stream)),
+        ("DEBUG, synchronous", lambda: synchronous(logging.DEBUG, stream)),
+    ]
+    blocks = range(0, args.balls, BLOCK)
+    print(f"{args.balls} balls, mean update_score time in us per block of {BLOCK} balls")
+    print(f"  {'':20s}" + "".join(f"{f'{b + 1}-{min(b + BLOCK, args.balls)}':>10s}" for b in blocks))
+    for name, setup in modes:
+        teardown = setup()
+        runs = [innings(args.balls) for _ in range(args.repeats)]
+        if teardown is not None:
+            teardown()
+        score_log.shutdown()
+        per_ball = [sorted(run[i] for run in runs)[len(runs) // 2] for i in range(args.balls)]
+        means = [sum(per_ball[b:b + BLOCK]) / len(per_ball[b:b + BLOCK]) for b in blocks]
+        print(f"  {name:20s}" + "".join(f"{m:10.1f}" for m in means))
+    print(f"  dropped records: {score_log.dropped()}")
+    stream.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/scoreboard_fanout.py
+"""Load test for the scoreboard WebSocket feed.
+
+Usage:
+    python benchmarks/scoreboard_fanout.py [clients] [updates]
+
+Starts the feed on its own thread (as inside the app), connects a swarm of
+local WebSocket clients to one match from this thread's event loop, then scores deliveries and measures how long each
+delta takes to reach every client (time from update_score to receipt).
+"""
+import asyncio
+import base64
+import os
+import resource
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SCORE_JOURNAL_DIR", "")  # Keep the benchmark off the disk
+
+from score_state import get_engine  # noqa: E402
+from scoreboard_server import start_in_background  # noqa: E402
+
+MATCH_ID = "fanout-bench"
+
+
+async def client(port, ready, received, counts):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((f"GET /ws?match={MATCH_ID} HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+                  f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+    await reader.readuntil(b"\r\n\r\n")
+    first = True
+    try:
+        while True:
+            header = await reader.readexactly(2)
+            length = header[1] & 0x7F
+            if length == 126:
+                length = int.from_bytes(await reader.readexactly(2), "big")
+            elif length == 127:
+                length = int.from_bytes(await reader.readexactly(8), "big")
+            await reader.readexactly(length)
+            if first:
+                first = False
+                ready.release()
+            else:
+                received.append(time.perf_counter())
+                counts[len(received) - 1] += 1
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    updates = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    # Every client costs two descriptors here (client and server side)
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = clients * 2 + 64
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
+        clients = min(clients, (min(wanted, hard) - 64) // 2)
+
+    engine = get_engine(MATCH_ID)
+    engine.reset_match(20)
+    engine._state["cooldown_period"] = 0  # Score back-to-back deliveries
+
+    server = start_in_background("127.0.0.1", 0)
+
+    ready = asyncio.Semaphore(0)
+    per_update = [[] for _ in range(updates)]
+    counts = [0] * updates  # Clients that have received update i
+    inboxes = [[] for _ in range(clients)]
+    tasks = [asyncio.create_task(client(server.port, ready, inbox, counts)) for inbox in inboxes]
+    for _ in range(clients):
+        await ready.acquire()
+    print(f"{clients} clients subscribed")
+
+    for i in range(updates):
+        sent = time.perf_counter()
+        await asyncio.to_thread(engine.update_score, i % 2 + 1)  # Alternate 1s and 2s to dodge the duplicate check
+        while counts[i] < clients:
+            await asyncio.sleep(0.001)
+        per_update[i] = [(inbox[i] - sent) * 1000 for inbox in inboxes]
+
+    for task in tasks:
+        task.cancel()
+
+    latencies = [value for update in per_update for value in update]
+    last_client = [max(update) for update in per_update]
+    print(f"{updates} updates x {clients} clients = {len(latencies)} deliveries")
+    print(f"Fan-out latency ms: p50 {percentile(latencies, 50):.2f}  p95 {percentile(latencies, 95):.2f}  "
+          f"p99 {percentile(latencies, 99):.2f}  max {max(latencies):.2f}")
+    print(f"Time until the last client has an update, ms: mean {statistics.mean(last_client):.2f}  "
+          f"max {max(last_client):.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+# benchmarks/scoreboard_render.py
+"""Server cost of redrawing the Streamlit scoreboard, before and after fragment caching.
+
+Usage:
+    python benchmarks/scoreboard_render.py [viewers] [balls]
+
+Scores `balls` deliveries (240 by default) with `viewers` sessions (10)
+watching. Like main_app.py's loop, every viewer redraws once when a ball
+is scored and then once a second while the 3 s cooldown counts down, each
+at a slightly different moment. Each redraw goes to recording placeholders
+that count the elements and the text bytes sent to the browser.
+
+Modes:
+  rebuild    the original loop: every fragment re-rendered and every
+             element re-sent on every tick
+  diffed     one long-lived FragmentSlots per viewer: memoized renders
+             shared by all viewers, only changed fragments sent (a loop
+             that never returns, which Streamlit cannot interrupt for a
+             button press)
+  rerun      main_app.py's st.fragment, rerun every second: memoized
+             renders, but each run starts from fresh placeholders and
+             sends everything
+"""
+import os
+import random
+import sys
+import time
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SCORE_JOURNAL_DIR", "")  # Keep the benchmark off the disk
+os.environ.setdefault("SCORE_LOG_LEVEL", "WARNING")
+
+import scoreboard_fragments  # noqa: E402
+from scoreboard_fragments import LEGEND, SCOREBOARD_FRAGMENTS, FragmentSlots, update_scoreboard  # noqa: E402
+from score_state import ScoreEngine  # noqa: E402
+
+GESTURES = [1, 0, 4, "wide", 2, 5, "dot_ball", 3, "no_ball", 1, 2, "dot_ball"]
+RENDERERS = ("render_result", "render_score_card", "render_first_innings", "render_extras", "render_cooldown",
+             "render_ball_by_ball", "render_stats")
+
+
+class Recorder:
+    """Stands in for a Streamlit placeholder; counts what would be sent to the browser"""
+
+    def __init__(self, totals):
+        self.totals = totals
+
+    def _send(self, text=""):
+        self.totals[0] += 1
+        self.totals[1] += len(text.encode())
+
+    def markdown(self, body, unsafe_allow_html=False):
+        self._send(body)
+
+    def code(self, body, language=None):
+        self._send(body)
+
+    def caption(self, body):
+        self._send(body)
+
+    def empty(self):
+        self._send()
+
+    def container(self):
+        self._send()
+        return self
+
+
+class FreshSlots:
+    """A fragment rerun: new placeholders on every tick"""
+
+    def __init__(self, names, make_placeholder):
+        self.args = names, make_placeholder
+
+
+class RebuildSlots(FragmentSlots):
+    """The old loop: every fragment is sent on every tick"""
+
+    def update(self, name, content, draw):
+        draw(self._slots[name], content)
+        self.sent += 1
+        return True
+
+
+def run(viewers, balls, slots_class, cached):
+    """(seconds spent redrawing, elements sent, bytes sent) for one simulated innings"""
+    # A fresh cache per run, or none for the old loop
+    for name in RENDERERS:
+        render = getattr(scoreboard_fragments, name)
+        render = getattr(render, "__wrapped__", render)
+        render = lru_cache(maxsize=scoreboard_fragments.CACHE_SIZE)(render) if cached else render
+        setattr(scoreboard_fragments, name, render)
+    totals = [0, 0]
+    rng = random.Random(0)
+    engine = ScoreEngine(match_overs=balls // 6 + 1, cooldown_period=0.0)
+    sessions = [slots_class(SCOREBOARD_FRAGMENTS, lambda: Recorder(totals)) for _ in range(viewers)]
+    legend = Recorder(totals)
+    elapsed = 0.0
+    for i in range(balls):
+        engine.update_score(GESTURES[i % len(GESTURES)])
+        engine.reset_gesture_flag()
+        score, stats = engine.get_score(), engine.get_stats()
+        for slots in sessions:
+            offset = rng.uniform(0.0, 0.2)  # When this viewer's loop wakes up
+            for cooldown in (3.0, 2.0 - offset, 1.0 - offset, 0.0):
+                start = time.perf_counter()
+                tick = FragmentSlots(*slots.args) if slots_class is FreshSlots else slots
+                update_scoreboard(tick, score[:6] + (cooldown,) + score[7:], stats, "Team A", "Team B", 40)
+                if slots_class is RebuildSlots:
+                    legend.markdown(LEGEND)  # Was drawn inside the redrawn container
+                elapsed += time.perf_counter() - start
+    return elapsed, totals[0], totals[1]
+
+
+def main():
+    viewers = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    balls = int(sys.argv[2]) if len(sys.argv) > 2 else 240
+    ticks = viewers * balls * 4
+    print(f"{viewers} viewers, {balls} balls, {ticks} redraws")
+    results = {}
+    for name, slots_class, cached in (("rebuild", RebuildSlots, False), ("diffed", FragmentSlots, True),
+                                      ("rerun", FreshSlots, True)):
+        elapsed, elements, sent = run(viewers, balls, slots_class, cached)
+        results[name] = (elapsed, sent)
+        print(f"  {name:10s} {elapsed / ticks * 1e6:7.1f} us/redraw  {elements / ticks:5.1f} elements/redraw  "
+              f"{sent / ticks:7.0f} bytes/redraw  {sent / 1024 / viewers:7.0f} KiB per viewer")
+    old_time, old_bytes = results["rebuild"]
+    for name in ("diffed", "rerun"):
+        new_time, new_bytes = results[name]
+        print(f"  {name}: CPU {old_time / new_time:.1f}x less, bytes {old_bytes / new_bytes:.1f}x fewer than rebuild")
+
+
+if __name__ == "__main__":
+    main()
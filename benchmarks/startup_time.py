@@ -0,0 +1,94 @@
+# benchmarks/startup_time.py
+"""Cold-start and rerun cost of the Streamlit app.
+
+Usage:
+    python benchmarks/startup_time.py [runs]
+
+Cold imports: each module is imported in a fresh interpreter `runs` times
+and the median wall time is printed, so the cost of the vision stack
+(gesture_pipeline, webrtc_gesture) can be compared with what the setup
+page needs (score_state). Reruns: if streamlit.testing is available
+main_app.py is run through AppTest, first run and reruns timed separately:
+the setup page, then the match page after pressing Start Match. AppTest
+has no browser for streamlit-webrtc, so the match page is run with the
+camera component unavailable (its "gesture detection unavailable" path);
+each of its runs includes the scoreboard fragment's wait for score
+changes (SCOREBOARD_WAIT in main_app.py). A run that raises is reported
+instead of timed.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)  # `streamlit run` puts the app's directory on the path; AppTest does not
+MODULES = ["streamlit", "score_state", "gesture_pipeline", "webrtc_gesture"]
+
+
+def cold_import(module):
+    """Seconds to import `module` in a new interpreter, or the error it raised"""
+    code = (f"import time; start = time.perf_counter(); import {module}; "
+            f"print(time.perf_counter() - start)")
+    env = dict(os.environ, SCORE_JOURNAL_DIR="")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode:
+        return result.stderr.strip().splitlines()[-1]
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def timed_run(run):
+    """Seconds `run` took, or the message of the exception the app raised"""
+    start = time.perf_counter()
+    app = run()
+    elapsed = time.perf_counter() - start
+    if app.exception:
+        return app.exception[0].message
+    return elapsed
+
+
+def timed_page(first_run, rerun, runs):
+    first = timed_run(first_run)
+    if isinstance(first, str):
+        return f"failed: {first}"
+    times = [timed_run(rerun) for _ in range(runs)]
+    errors = [t for t in times if isinstance(t, str)]
+    if errors:
+        return f"rerun failed: {errors[0]}"
+    return f"first run {first * 1000:.0f} ms, rerun median {statistics.median(times) * 1000:.0f} ms"
+
+
+def page_reruns(runs):
+    """Returns (setup page result, match page result)"""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError as e:
+        return f"skipped ({e})", f"skipped ({e})"
+    os.environ["SCORE_JOURNAL_DIR"] = ""
+    sys.modules["webrtc_gesture"] = None  # Import fails, so main_app takes its no-camera path
+    app = AppTest.from_file(os.path.join(ROOT, "main_app.py"), default_timeout=30)
+    setup = timed_page(app.run, app.run, runs)
+    start_match = next((b for b in app.button if "Start Match" in b.label), None)
+    if start_match is None:
+        return setup, "skipped (no Start Match button)"
+    return setup, timed_page(start_match.click().run, app.run, runs)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print("Cold import, median of", runs)
+    for module in MODULES:
+        samples = [cold_import(module) for _ in range(runs)]
+        errors = [s for s in samples if isinstance(s, str)]
+        if errors:
+            print(f"  {module:18s} failed: {errors[0]}")
+        else:
+            print(f"  {module:18s} {statistics.median(samples) * 1000:8.1f} ms")
+    setup, match = page_reruns(runs)
+    print("Setup page:", setup)
+    print("Match page:", match)
+
+
+if __name__ == "__main__":
+    main()
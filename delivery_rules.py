@@ -0,0 +1,85 @@
+# delivery_rules.py
+"""What each delivery outcome does to the score, as one table.
+
+RULES lists the base outcomes - the umpire gestures plus run out - and
+combined outcomes such as "WD+2" (a wide and two more runs taken) or
+"NB+4" (a no ball hit for four) are generated from them. compile_outcomes
+turns the rows into OUTCOMES, a dict from gesture to Outcome, so scoring a
+delivery is one lookup followed by integer arithmetic.
+"""
+from collections import namedtuple
+
+# Effect of an outcome on the free hit: the next ball becomes one, it carries over, or it is used up.
+# Any legal delivery uses it up, byes and leg byes included; wides and penalty runs carry it over
+SET_FREE_HIT, KEEP_FREE_HIT, USE_FREE_HIT = "set", "keep", "use"
+
+Outcome = namedtuple("Outcome", [
+    "gesture",
+    "runs",  # Added to the team total
+    "bat_runs",  # Part of runs scored off the bat (boundaries count these)
+    "extras",  # Part of runs that are extras
+    "bucket",  # State counter the extras go into: "wides", "noballs", "byes", "legbyes" or None
+    "legal",  # Counts towards the over
+    "wicket",  # A batter is out...
+    "out_on_free_hit",  # ...even on a free hit (run out)
+    "free_hit",  # SET_FREE_HIT, KEEP_FREE_HIT or USE_FREE_HIT
+    "symbol",  # Ball-by-ball text
+    "not_out_symbol",  # Ball-by-ball text when a wicket does not stand on a free hit
+    "action",  # Last-action text
+    "free_hit_action",  # Last-action text when bowled as a free hit
+])
+
+# gesture, bat runs, extras, bucket, legal, wicket, out on free hit, free hit, symbol, action[, free-hit action]
+RULES = [
+    (0, 0, 0, None, True, True, False, USE_FREE_HIT, "W", "WICKET!", "Free Hit - No Wicket (Dot Ball)"),
+    (1, 1, 0, None, True, False, False, USE_FREE_HIT, "1", "1 Run"),
+    (2, 2, 0, None, True, False, False, USE_FREE_HIT, "2", "2 Runs"),
+    (3, 3, 0, None, True, False, False, USE_FREE_HIT, "3", "3 Runs"),
+    (4, 4, 0, None, True, False, False, USE_FREE_HIT, "4", "4 Runs (Boundary)", "4 Runs - Boundary (Free Hit)"),
+    (5, 6, 0, None, True, False, False, USE_FREE_HIT, "6", "6 Runs (Six!)", "6 Runs - Six! (Free Hit)"),
+    ("dot_ball", 0, 0, None, True, False, False, USE_FREE_HIT, "•", "Dot Ball"),
+    ("no_ball", 0, 1, "noballs", False, False, False, SET_FREE_HIT, "NB", "NO BALL! (+1 run, Free Hit next)"),
+    ("wide", 0, 1, "wides", False, False, False, KEEP_FREE_HIT, "WD", "WIDE! (+1 run)"),
+    ("bye", 0, 1, "byes", True, False, False, USE_FREE_HIT, "B1", "BYE! (+1 run)"),
+    ("leg_bye", 0, 1, "legbyes", True, False, False, USE_FREE_HIT, "LB1", "LEG BYE! (+1 run)"),
+    ("run_out", 0, 0, None, True, True, True, USE_FREE_HIT, "W", "RUN OUT!"),
+    ("penalty", 0, 5, None, False, False, False, KEEP_FREE_HIT, "P5", "5 PENALTY RUNS!"),
+]
+
+
+def combined_rules():
+    """Rows for extras with more runs: WD+1..4, NB+1..6, B2..4 and LB2..4"""
+    rows = []
+    for runs in range(1, 5):
+        rows.append((f"WD+{runs}", 0, 1 + runs, "wides", False, False, False, KEEP_FREE_HIT,
+                     f"WD+{runs}", f"WIDE! (+{1 + runs} runs)"))
+    for runs in range(1, 7):
+        rows.append((f"NB+{runs}", runs, 1, "noballs", False, False, False, SET_FREE_HIT,
+                     f"NB+{runs}", f"NO BALL! (+{1 + runs} runs, Free Hit next)"))
+    for runs in range(2, 5):
+        rows.append((f"B{runs}", 0, runs, "byes", True, False, False, USE_FREE_HIT, f"B{runs}", f"BYES! (+{runs} runs)"))
+        rows.append((f"LB{runs}", 0, runs, "legbyes", True, False, False, USE_FREE_HIT,
+                     f"LB{runs}", f"LEG BYES! (+{runs} runs)"))
+    return rows
+
+
+def compile_outcomes(rules):
+    """Build the gesture -> Outcome dispatch map from table rows"""
+    outcomes = {}
+    for row in rules:
+        gesture, bat_runs, extras, bucket, legal, wicket, out_on_free_hit, free_hit, symbol, action = row[:10]
+        if len(row) > 10:
+            free_hit_action = row[10]
+        elif free_hit == USE_FREE_HIT:
+            free_hit_action = f"{action} (Free Hit)"
+        else:
+            free_hit_action = action
+        if gesture in outcomes:
+            raise ValueError(f"Duplicate delivery outcome {gesture!r}")
+        outcomes[gesture] = Outcome(gesture, bat_runs + extras, bat_runs, extras, bucket, legal, wicket,
+                                    out_on_free_hit, free_hit, symbol, "•" if wicket else symbol,
+                                    action, free_hit_action)
+    return outcomes
+
+
+OUTCOMES = compile_outcomes(RULES + combined_rules())
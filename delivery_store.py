@@ -0,0 +1,125 @@
+# delivery_store.py
+"""Columnar ball log: every delivery of a match in a handful of typed arrays.
+
+One delivery costs 12 bytes (kind, runs, flags, innings: one byte each,
+plus the time as int64 milliseconds from the first ball) instead of a
+namedtuple and a display string, and the log keeps both innings. Rows come
+back as Delivery tuples on demand; columns() hands the arrays to NumPy
+for analytics such as per-over totals. The extras type needs no column of
+its own: it follows from the kind, so columns() looks it up per delivery.
+"""
+from array import array
+from collections import namedtuple
+
+import numpy as np
+
+from delivery_rules import OUTCOMES
+
+# One confirmed delivery in the append-only ball log.
+# free_hit: bowled as a free hit (missing in ball logs from before it was recorded)
+Delivery = namedtuple("Delivery", [
+    "gesture", "symbol", "runs", "legal", "wicket", "innings", "timestamp", "free_hit",
+], defaults=(False,))
+
+# Per kind code, in delivery_rules.OUTCOMES order
+KINDS = tuple(OUTCOMES)  # Gesture
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+SYMBOLS = tuple(outcome.symbol for outcome in OUTCOMES.values())  # Ball-by-ball text
+NOT_OUT_SYMBOLS = tuple(outcome.not_out_symbol for outcome in OUTCOMES.values())  # ...if no wicket fell
+EXTRAS = tuple(outcome.bucket for outcome in OUTCOMES.values())  # Extras type
+
+# Extras type codes of the "extras" column; 0 is a delivery without extras
+EXTRA_TYPES = (None, "wides", "noballs", "byes", "legbyes")
+KIND_EXTRA_CODES = np.array([EXTRA_TYPES.index(bucket) for bucket in EXTRAS], dtype=np.uint8)
+
+WICKET, LEGAL, FREE_HIT = 1, 2, 4  # Bits of the flags column
+
+
+class DeliveryStore:
+    def __init__(self, rows=()):
+        self.kind = array("B")
+        self.runs = array("b")  # Team runs off the delivery, extras included
+        self.flags = array("B")
+        self.innings = array("B")
+        self.time_ms = array("q")  # Milliseconds since `origin`; int32 would wrap after 24.8 days
+        self.origin = None  # Timestamp of the first delivery
+        for row in rows:
+            self.append(row)
+
+    def append(self, delivery):
+        """Add a Delivery"""
+        if self.origin is None:
+            self.origin = delivery.timestamp
+        self.kind.append(KIND_CODES[delivery.gesture])
+        self.runs.append(delivery.runs)
+        self.flags.append((WICKET if delivery.wicket else 0) | (LEGAL if delivery.legal else 0) |
+                          (FREE_HIT if delivery.free_hit else 0))
+        self.innings.append(delivery.innings)
+        self.time_ms.append(round((delivery.timestamp - self.origin) * 1000))
+
+    def pop(self):
+        """Remove and return the last delivery"""
+        delivery = self[-1]
+        for column in (self.kind, self.runs, self.flags, self.innings, self.time_ms):
+            column.pop()
+        return delivery
+
+    def __len__(self):
+        return len(self.kind)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("delivery index out of range")
+        return self.row(index)
+
+    def __iter__(self):
+        return (self.row(i) for i in range(len(self)))
+
+    def row(self, i):
+        flags = self.flags[i]
+        return Delivery(KINDS[self.kind[i]], self.symbol(i), self.runs[i], bool(flags & LEGAL),
+                        bool(flags & WICKET), self.innings[i], self.origin + self.time_ms[i] / 1000,
+                        bool(flags & FREE_HIT))
+
+    def symbol(self, i):
+        return (SYMBOLS if self.flags[i] & WICKET else NOT_OUT_SYMBOLS)[self.kind[i]]
+
+    def symbols(self, start=0, stop=None):
+        """Ball-by-ball text of deliveries start..stop, e.g. symbols(len(store) - 18) for the last 18"""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        return tuple(self.symbol(i) for i in range(start, stop))
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column)
+                   for column in (self.kind, self.runs, self.flags, self.innings, self.time_ms))
+
+    def columns(self):
+        """The columns as NumPy arrays: kind, extras (codes into EXTRA_TYPES), runs, wicket, legal,
+        free_hit, innings, time_ms.
+
+        They are copies (a few bytes per delivery): an array.array cannot
+        grow while NumPy holds a view of it.
+        """
+        flags = np.frombuffer(self.flags, dtype=np.uint8).copy()
+        kind = np.frombuffer(self.kind, dtype=np.uint8).copy()
+        return {"kind": kind,
+                "extras": KIND_EXTRA_CODES[kind],
+                "runs": np.frombuffer(self.runs, dtype=np.int8).copy(),
+                "wicket": (flags & WICKET) != 0,
+                "legal": (flags & LEGAL) != 0,
+                "free_hit": (flags & FREE_HIT) != 0,
+                "innings": np.frombuffer(self.innings, dtype=np.uint8).copy(),
+                "time_ms": np.frombuffer(self.time_ms, dtype=np.int64).copy()}
+
+    def over_runs(self, innings):
+        """Runs in each over of an innings (the last one may be incomplete) as a NumPy array"""
+        columns = self.columns()
+        mine = columns["innings"] == innings
+        legal = columns["legal"][mine]
+        # A delivery belongs to the over of the legal balls bowled before it
+        over = (np.cumsum(legal) - legal) // 6
+        return np.bincount(over, weights=columns["runs"][mine], minlength=0).astype(np.int64)
@@ -0,0 +1,103 @@
+# frame_ring.py
+"""Ring of frame buffers in shared memory, one writer and one reader.
+
+The capture side asks for a free slot, writes the frame straight into it
+and publishes it; the inference side takes the newest published slot as a
+NumPy view, with no pickling or copying between processes. A small header
+in the same block records each slot's sequence number and capture time,
+the newest slot and the slot the reader holds. The writer never picks
+either of those, so with three or more slots a frame is never overwritten
+while it is being read. The lock is only held for that bookkeeping.
+"""
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+LATEST, HELD = 0, 1  # Control words in the header
+
+
+class SharedFrameRing:
+    def __init__(self, shape, slots=3, dtype=np.uint8, lock=None, name=None):
+        if slots < 3:
+            raise ValueError("A frame ring needs at least 3 slots")
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.dtype = np.dtype(dtype)
+        self.lock = lock if lock is not None else multiprocessing.Lock()
+        self._owner = name is None
+        header = 64 * ((slots * 16 + 16 + 63) // 64)  # Keeps the frames cache-line aligned
+        frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        if self._owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=header + slots * frame_bytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self._attach(header)
+        if self._owner:
+            self.seq[:] = 0
+            self.stamps[:] = 0.0
+            self.control[:] = -1
+        self._next_seq = 0
+
+    def _attach(self, header):
+        buf = self.shm.buf
+        self.seq = np.ndarray((self.slots,), np.int64, buf, 0)
+        self.stamps = np.ndarray((self.slots,), np.float64, buf, self.slots * 8)
+        self.control = np.ndarray((2,), np.int64, buf, self.slots * 16)
+        self.frames = np.ndarray((self.slots,) + self.shape, self.dtype, buf, header)
+
+    def __getstate__(self):
+        # Other processes attach to the same block by name
+        return {"shape": self.shape, "slots": self.slots, "dtype": self.dtype.str,
+                "lock": self.lock, "name": self.shm.name}
+
+    def __setstate__(self, state):
+        self.__init__(state["shape"], state["slots"], state["dtype"], state["lock"], state["name"])
+
+    def write_slot(self):
+        """Pick a slot for the next frame; returns (slot, writable view)"""
+        with self.lock:
+            latest, held = self.control
+            free = [i for i in range(self.slots) if i != latest and i != held]
+        slot = min(free, key=lambda i: self.seq[i])  # Oldest frame goes first
+        return slot, self.frames[slot]
+
+    def publish(self, slot):
+        """Make a written slot the newest frame; returns its capture time"""
+        with self.lock:
+            self._next_seq += 1
+            now = time.time()
+            self.seq[slot] = self._next_seq
+            self.stamps[slot] = now
+            self.control[LATEST] = slot
+        return now
+
+    def read_latest(self, after_seq):
+        """Hold the newest frame if it is newer than `after_seq`.
+
+        Returns (slot, seq, capture time, read-only view); slot is -1 and the
+        view None when there is nothing new, and the time is then the time of
+        the check - every frame published later will be stamped after it.
+        Call release() when done with a held frame.
+        """
+        with self.lock:
+            slot = int(self.control[LATEST])
+            if slot < 0 or self.seq[slot] <= after_seq:
+                return -1, after_seq, time.time(), None
+            self.control[HELD] = slot
+            seq, stamp = int(self.seq[slot]), float(self.stamps[slot])
+        view = self.frames[slot]
+        view.flags.writeable = False
+        return slot, seq, stamp, view
+
+    def release(self):
+        with self.lock:
+            self.control[HELD] = -1
+
+    def close(self):
+        """Detach; the creating process also frees the block"""
+        self.seq = self.stamps = self.control = self.frames = None
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
@@ -0,0 +1,167 @@
+# gesture_confirmation.py
+"""Hold-to-confirm state machines shared by the live pipeline and the replay benchmarks.
+
+A gesture has to be held for `delay` seconds before it is scored, and the
+same gesture is not scored twice in a row until the hand leaves the frame.
+HoldConfirmer is the strict version: every frame has to agree, so one
+misclassified or dropped frame restarts the timer. VoteConfirmer keeps the
+last few frames in a ring buffer and holds whichever gesture has a weighted
+majority of them, so single-frame glitches are outvoted instead. Time is
+passed in by the caller, so the same logic runs on wall-clock frames or on
+recorded timestamps.
+"""
+from collections import namedtuple
+
+# gesture: what is being held; action: the gesture to score this frame, or None
+HoldStatus = namedtuple("HoldStatus", ["gesture", "held", "remaining", "confirmed", "action"])
+
+NO_HOLD = HoldStatus(None, 0.0, 0.0, False, None)
+
+
+class HoldConfirmer:
+    def __init__(self, delay=5.0):
+        self.delay = delay
+        self.current = None  # Gesture being held
+        self.start_time = None  # When the current hold started
+        self.last_confirmed = None  # Last scored gesture, blocks repeats until the hand leaves
+
+    def reset(self):
+        """No hand in view - drop the hold and allow any gesture to score again"""
+        self.current = None
+        self.start_time = None
+        self.last_confirmed = None
+
+    def deadline(self):
+        """Time at which the current hold would confirm, or None"""
+        if self.start_time is None:
+            return None
+        return self.start_time + self.delay
+
+    def no_hand(self, now):
+        """No hand on this frame; returns True once the hand counts as gone"""
+        self.reset()
+        return True
+
+    def update(self, gesture, now, confidence=1.0):
+        """Feed the gesture seen on one frame (a special gesture name or a finger count)"""
+        if gesture is None:
+            return NO_HOLD
+        if gesture != self.current:
+            # New gesture detected
+            self.current = gesture
+            self.start_time = now
+            return HoldStatus(gesture, 0.0, self.delay, False, None)
+
+        held = now - self.start_time
+        if held < self.delay:
+            return HoldStatus(gesture, held, self.delay - held, False, None)
+
+        # Confirmed - the next frame starts a fresh hold
+        self.current = None
+        self.start_time = None
+        action = None
+        if gesture != self.last_confirmed:
+            action = gesture
+            self.last_confirmed = gesture
+        return HoldStatus(gesture, held, 0.0, True, action)
+
+
+# Everything a frame can vote for; None is a frame without a hand
+VOTE_LABELS = (None, 0, 1, 2, 3, 4, 5, "dot_ball", "no_ball", "wide")
+VOTE_SLOTS = {label: i for i, label in enumerate(VOTE_LABELS)}
+NO_HAND = VOTE_SLOTS[None]
+
+
+class VoteConfirmer:
+    def __init__(self, delay=1.0, window=0.6, majority=0.6, size=32):
+        self.delay = delay  # How long a gesture must keep its majority
+        self.window = window  # Seconds of frames that vote
+        self.majority = majority  # Share of the vote weight the leading gesture needs
+        self.size = size  # Ring capacity, caps the frames in the window at high frame rates
+        self.slots = [NO_HAND] * size
+        self.weights = [0.0] * size
+        self.times = [0.0] * size
+        self.totals = [0.0] * len(VOTE_LABELS)  # Vote weight per label over the window
+        self.total = 0.0
+        self.head = 0  # Next ring index to write
+        self.count = 0  # Votes in the window
+        self.current = None  # Gesture holding the majority
+        self.start_time = None  # When it took the majority
+        self.last_confirmed = None  # Last scored gesture, blocks repeats until the hand leaves
+
+    def reset(self):
+        """Hand gone - forget the votes and allow any gesture to score again"""
+        self.totals = [0.0] * len(VOTE_LABELS)
+        self.total = 0.0
+        self.count = 0
+        self.current = None
+        self.start_time = None
+        self.last_confirmed = None
+
+    def deadline(self):
+        """Time at which the current hold would confirm, or None"""
+        if self.start_time is None:
+            return None
+        return self.start_time + self.delay
+
+    def vote(self, slot, weight, now):
+        """Add one frame's vote and drop votes that left the window; O(1) amortized"""
+        cutoff = now - self.window
+        while self.count and (self.count == self.size or
+                              self.times[(self.head - self.count) % self.size] < cutoff):
+            oldest = (self.head - self.count) % self.size
+            self.totals[self.slots[oldest]] -= self.weights[oldest]
+            self.total -= self.weights[oldest]
+            self.count -= 1
+        self.slots[self.head] = slot
+        self.weights[self.head] = weight
+        self.times[self.head] = now
+        self.totals[slot] += weight
+        self.total += weight
+        self.head = (self.head + 1) % self.size
+        self.count += 1
+
+    def leader(self):
+        """Slot with the most vote weight if it holds the majority, else None"""
+        slot = max(range(len(self.totals)), key=self.totals.__getitem__)
+        if self.totals[slot] < self.majority * self.total:
+            return None
+        return slot
+
+    def no_hand(self, now):
+        """No hand on this frame; returns True once missing frames hold the majority"""
+        self.vote(NO_HAND, 1.0, now)
+        if self.leader() != NO_HAND:
+            return False  # A dropped frame or two, the hold goes on
+        self.reset()
+        return True
+
+    def update(self, gesture, now, confidence=1.0):
+        """Feed the gesture seen on one frame, weighted by the classifier's confidence in it"""
+        if gesture is None:
+            return NO_HOLD
+        self.vote(VOTE_SLOTS[gesture], confidence, now)
+        slot = self.leader()
+        if slot is None or slot == NO_HAND:
+            # No clear majority - nothing is being held
+            self.current = None
+            self.start_time = None
+            return HoldStatus(gesture, 0.0, self.delay, False, None)
+        gesture = VOTE_LABELS[slot]
+        if gesture != self.current:
+            self.current = gesture
+            self.start_time = now
+            return HoldStatus(gesture, 0.0, self.delay, False, None)
+
+        held = now - self.start_time
+        if held < self.delay:
+            return HoldStatus(gesture, held, self.delay - held, False, None)
+
+        # Confirmed - the next frame starts a fresh hold
+        self.current = None
+        self.start_time = None
+        action = None
+        if gesture != self.last_confirmed:
+            action = gesture
+            self.last_confirmed = gesture
+        return HoldStatus(gesture, held, 0.0, True, action)
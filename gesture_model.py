@@ -0,0 +1,152 @@
+# gesture_model.py
+"""Learned gesture classifier, a drop-in alternative to landmark_classifier.
+
+Hands are first put into a canonical pose: moved so the wrist is at the
+origin, rotated so the wrist -> middle-finger knuckle line points straight
+up, scaled so that line has unit length and, for left hands, mirrored. The
+features are the 21 canonical (x, y) points plus the distances between the
+five fingertips, so a tilted or smaller hand looks the same to the model.
+A one-hidden-layer MLP in plain NumPy maps them to a gesture, or to
+"none" for a hand that shows no signal; a batch of hands is two small
+matrix products.
+
+Weights are trained by train_gesture_model.py and stored in
+models/gesture_mlp_v<N>.npz. classify_batch and classify_landmarks return
+the same values as the rule-based functions, so callers can switch
+between the two with GESTURE_CLASSIFIER=model (see get_classifier); a
+rejected hand is NO_GESTURE with -1 fingers in a batch, (None, None) alone.
+"""
+import os
+
+import numpy as np
+
+from landmark_classifier import GESTURE_LABELS, NO_GESTURE
+from landmark_classifier import classify_landmarks as classify_rules
+
+MODEL_VERSION = 2
+FEATURE_VERSION = 1  # Bump when landmark_features changes; old weights then refuse to load
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+DEFAULT_MODEL = os.path.join(MODEL_DIR, f"gesture_mlp_v{MODEL_VERSION}.npz")
+
+# Classes the model predicts: finger counts as strings, the special gestures, then no signal
+NONE_CLASS = "none"
+CLASSES = ("0", "1", "2", "3", "4", "5", "dot_ball", "no_ball", "wide", NONE_CLASS)
+
+WRIST = 0
+MIDDLE_MCP = 9
+INDEX_MCP = 5
+PINKY_MCP = 17
+TIPS = np.array([4, 8, 12, 16, 20])
+TIP_PAIRS = np.array([(a, b) for a in range(5) for b in range(a + 1, 5)])
+
+
+def landmark_features(points):
+    """Rotation-, scale- and handedness-normalized features of a (N, 21, 3) batch; returns (N, 52) float32"""
+    points = np.asarray(points, dtype=np.float32)
+    xy = points[:, :, :2] - points[:, WRIST:WRIST + 1, :2]
+    axis = xy[:, MIDDLE_MCP]
+    length = np.maximum(np.hypot(axis[:, 0], axis[:, 1]), 1e-6)
+    # Rotate so the wrist -> middle knuckle line points along -y (up in image coordinates)
+    cos = -axis[:, 1] / length
+    sin = -axis[:, 0] / length
+    x = (xy[:, :, 0] * cos[:, None] - xy[:, :, 1] * sin[:, None]) / length[:, None]
+    y = (xy[:, :, 0] * sin[:, None] + xy[:, :, 1] * cos[:, None]) / length[:, None]
+    # Mirror left hands (pinky knuckle left of the index knuckle) onto right hands
+    x *= np.where(x[:, PINKY_MCP] < x[:, INDEX_MCP], -1.0, 1.0).astype(np.float32)[:, None]
+    tip_x, tip_y = x[:, TIPS], y[:, TIPS]
+    distances = np.hypot(tip_x[:, TIP_PAIRS[:, 0]] - tip_x[:, TIP_PAIRS[:, 1]],
+                         tip_y[:, TIP_PAIRS[:, 0]] - tip_y[:, TIP_PAIRS[:, 1]])
+    return np.concatenate([x, y, distances], axis=1).astype(np.float32)
+
+
+class GestureModel:
+    def __init__(self, w1, b1, w2, b2, mean, std, classes=CLASSES, version=MODEL_VERSION):
+        self.w1, self.b1, self.w2, self.b2 = w1, b1, w2, b2
+        self.mean, self.std = mean, std  # Feature standardization from the training set
+        self.classes = tuple(str(c) for c in classes)
+        self.version = int(version)
+        # Per class: the (code, fingers) pair classify_batch returns for it
+        self.codes = np.array([GESTURE_LABELS.index(c) if c in GESTURE_LABELS else NO_GESTURE
+                               for c in self.classes], dtype=np.int8)
+        self.fingers = np.array([int(c) if c.isdigit() else -1 for c in self.classes], dtype=np.int8)
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL):
+        data = np.load(path)
+        if int(data["feature_version"]) != FEATURE_VERSION:
+            raise ValueError(f"{path} was trained on feature version {int(data['feature_version'])}, "
+                             f"this code computes version {FEATURE_VERSION}; retrain it")
+        return cls(data["w1"], data["b1"], data["w2"], data["b2"], data["mean"], data["std"],
+                   data["classes"], data["version"])
+
+    def save(self, path):
+        np.savez(path, w1=self.w1, b1=self.b1, w2=self.w2, b2=self.b2, mean=self.mean, std=self.std,
+                 classes=np.array(self.classes), version=self.version, feature_version=FEATURE_VERSION)
+
+    def logits(self, features):
+        hidden = np.maximum((features - self.mean) / self.std @ self.w1 + self.b1, 0.0)
+        return hidden @ self.w2 + self.b2
+
+    def probabilities(self, points):
+        """Class probabilities for a (N, 21, 3) batch; returns (N, len(classes))"""
+        logits = self.logits(landmark_features(points))
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def classify_batch(self, points):
+        """Same contract as landmark_classifier.classify_batch: (codes, fingers) int8 arrays"""
+        best = self.logits(landmark_features(points)).argmax(axis=1)
+        return self.codes[best], self.fingers[best]
+
+    def confidence(self, points):
+        """Probability the model gives its chosen class for one (21, 3) hand"""
+        return float(self.probabilities(np.asarray(points, dtype=np.float32)[np.newaxis]).max())
+
+    def classify_landmarks(self, points):
+        """Same contract as landmark_classifier.classify_landmarks"""
+        points = np.asarray(points, dtype=np.float32)
+        if points.ndim == 3:
+            return self.classify_batch(points)
+        codes, fingers = self.classify_batch(points[np.newaxis])
+        code, count = int(codes[0]), int(fingers[0])
+        if code != NO_GESTURE:
+            return GESTURE_LABELS[code], None
+        return None, (count if count >= 0 else None)
+
+
+_model = None
+
+
+def load_model():
+    """The default model, loaded once per process"""
+    global _model
+    if _model is None:
+        _model = GestureModel.load()
+    return _model
+
+
+def get_classifier(name=None):
+    """classify_landmarks of the rules ("rules", the default) or the learned model ("model").
+
+    `name` defaults to the GESTURE_CLASSIFIER environment variable.
+    """
+    if name is None:
+        name = os.environ.get("GESTURE_CLASSIFIER", "rules")
+    if name == "rules":
+        return classify_rules
+    if name == "model":
+        return load_model().classify_landmarks
+    raise ValueError(f"Unknown gesture classifier {name!r}, expected 'rules' or 'model'")
+
+
+def get_confidence(name=None):
+    """How sure the classifier get_classifier(name) is of one hand, or None when it can't say.
+
+    The rules give no probability, so their votes all weigh 1.0.
+    """
+    if name is None:
+        name = os.environ.get("GESTURE_CLASSIFIER", "rules")
+    if name == "model":
+        return load_model().confidence
+    return None
@@ -0,0 +1,191 @@
+# gesture_pipeline.py
+"""One gesture pipeline for every front-end.
+
+    capture -> preprocess -> infer -> classify -> confirm -> emit
+
+The front-ends only capture frames and show them: run_gesture_controller
+reads the local camera, and the WebRTC VideoProcessor (used by both
+webrtc_gesture.py and main_app.py) receives browser frames. Everything else
+(persistent Hands session, ROI crop, frame skipping, classification,
+hold-to-confirm and scoring) happens here, without touching Streamlit
+state: either inline on the thread that delivers the frame (process), or
+split so an inference_workers pool runs infer() while the video path only
+calls draw().
+"""
+import threading
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from gesture_confirmation import VoteConfirmer
+from hand_roi import HandRoi
+from inference_scheduler import InferenceScheduler
+from gesture_model import get_classifier, get_confidence
+from landmark_classifier import landmarks_to_array
+from pipeline_timing import NO_TIMER
+from score_state import DEFAULT_MATCH_ID, reset_gesture_flag, update_score
+
+mp_hands = mp.solutions.hands
+mp_drawing = mp.solutions.drawing_utils
+
+# Overlay text per gesture (plain ASCII, cv2.putText cannot draw emoji)
+GESTURE_TEXT = {
+    0: "WICKET!",
+    1: "1 RUN",
+    2: "2 RUNS",
+    3: "3 RUNS",
+    4: "4 RUNS",
+    5: "6 RUNS (Six!)",
+    "dot_ball": "DOT BALL",
+    "no_ball": "NO BALL + Free Hit",
+    "wide": "WIDE",
+    None: "No signal",
+}
+
+
+def create_hands():
+    """Create a MediaPipe Hands session in video mode so landmarks are tracked between frames"""
+    return mp_hands.Hands(static_image_mode=False,
+                          min_detection_confidence=0.7,
+                          min_tracking_confidence=0.5,
+                          max_num_hands=1)
+
+
+def draw_overlay(frame, hand_landmarks, overlay, timer=NO_TIMER):
+    """Draw landmarks and (text, org, scale, color, thickness) labels onto a frame"""
+    if hand_landmarks is not None:
+        mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+        timer.lap("draw_landmarks")
+    for text, org, scale, color, thickness in overlay + timer.overlay_lines():
+        cv2.putText(frame, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+    timer.lap("putText")
+
+
+class GesturePipeline:
+    def __init__(self, match_id=DEFAULT_MATCH_ID, confirmation_delay=1.0,
+                 scheduler=None, roi=None, timer=NO_TIMER, on_confirm=None, on_reset=None, confirmer=None,
+                 classifier=None, confidence=None):
+        self.match_id = match_id  # Confirmed gestures score this match
+        # Hands graphs for the life of the pipeline: one tracks the hand inside the fixed ROI
+        # crop, the other scans full frames, so neither sees its input size change
+        self.hands = create_hands()
+        self.scan_hands = create_hands()
+        self.scheduler = scheduler if scheduler is not None else InferenceScheduler()
+        self.roi = roi if roi is not None else HandRoi()
+        # Majority vote over recent frames; pass a HoldConfirmer for the strict every-frame hold
+        self.confirmer = confirmer if confirmer is not None else VoteConfirmer(delay=confirmation_delay)
+        # Rules or learned model (GESTURE_CLASSIFIER), both return (special, fingers)
+        self.classify = classifier if classifier is not None else get_classifier()
+        # Probability the classifier gives its answer, weighting that frame's vote; None counts every frame 1.0
+        self.confidence = confidence if confidence is not None or classifier is not None else get_confidence()
+        self.timer = timer
+        self.on_confirm = on_confirm  # Called with each confirmed gesture instead of update_score
+        self.on_reset = on_reset  # Called when the hand leaves instead of reset_gesture_flag
+        self.points = np.empty((21, 3), dtype=np.float32)
+
+        # Overlay from the last inference frame, redrawn on skipped frames.
+        # Replaced rather than mutated, so another thread can draw them
+        self.last_landmarks = None
+        self.last_overlay = []
+        self.lock = threading.Lock()  # Serializes inference
+        self.schedule_lock = threading.Lock()  # Guards the scheduler, never held during inference
+
+    def process(self, image_bgr, now=None):
+        """Run one BGR frame through the pipeline and draw the overlay on it in place"""
+        if now is None:
+            now = time.time()
+        if self.should_infer(now):
+            self.infer(image_bgr, now)
+        else:
+            self.timer.count("skipped")
+        self.draw(image_bgr)
+        return image_bgr
+
+    def should_infer(self, now):
+        """Whether the scheduler wants inference on a frame arriving at `now`"""
+        with self.schedule_lock:
+            return self.scheduler.should_infer(now)
+
+    def draw(self, image_bgr, timer=None):
+        """Draw the overlay from the last inference onto a frame"""
+        draw_overlay(image_bgr, self.last_landmarks, self.last_overlay, timer or self.timer)
+
+    def infer(self, image_bgr, now):
+        """Detect, classify and confirm on one frame; updates the overlay and scores confirmed gestures"""
+        with self.lock:
+            if self.hands is None:
+                return
+            # Crop around the last known hand, or scan the full frame when tracking is lost
+            results = self.roi.process(self.hands, image_bgr, self.timer, scan_hands=self.scan_hands)
+            overlay = []
+
+            if not results.multi_hand_landmarks:
+                # No hand - once it is really gone, the same gesture can score again
+                if self.confirmer.no_hand(now):
+                    self.hand_left()
+                self.timer.count("no_hand")
+                overlay.append(("Show hand gesture...", (10, 30), 0.7, (128, 128, 128), 2))
+                self.last_landmarks, self.last_overlay = None, overlay
+                with self.schedule_lock:
+                    self.scheduler.record(False, now=now)
+                return
+
+            hand_landmarks = results.multi_hand_landmarks[0]
+            points = landmarks_to_array(hand_landmarks, out=self.points)
+            special, fingers = self.classify(points)
+            gesture = special if special else fingers
+            confidence = self.confidence(points) if self.confidence is not None else 1.0
+            self.timer.lap("classify")
+
+            # Hold-to-confirm on wall-clock time, so skipped frames don't matter
+            status = self.confirmer.update(gesture, now, confidence)
+            gesture = status.gesture
+            text = GESTURE_TEXT.get(gesture, str(gesture))
+            color = (255, 255, 0)
+            if status.confirmed:
+                text += " - CONFIRMED!"
+                color = (0, 255, 0)
+                if status.action is not None:
+                    self.emit(status.action)
+                    self.timer.lap("update_score")
+            elif status.held > 0:
+                text += f" - Hold {status.remaining:.1f}s"
+                progress = int(status.held / self.confirmer.delay * 30)
+                overlay.append((f"[{'|' * progress}{'.' * (30 - progress)}]", (10, 60), 0.5, (0, 255, 255), 1))
+            overlay.append((text, (10, 30), 0.7, color, 2))
+            self.last_landmarks, self.last_overlay = hand_landmarks, overlay
+
+            # Speed up while a gesture is held, and wake exactly when it would confirm
+            deadline = self.confirmer.deadline()
+            with self.schedule_lock:
+                if deadline is not None:
+                    self.scheduler.record(True, holding=True, confirm_at=deadline, now=now)
+                else:
+                    self.scheduler.record(True, now=now)
+
+    def emit(self, gesture):
+        """Score a confirmed gesture"""
+        if self.on_confirm is not None:
+            self.on_confirm(gesture)
+        else:
+            update_score(gesture, self.match_id)
+
+    def hand_left(self):
+        """Let the same gesture score again now that the hand is out of view"""
+        if self.on_reset is not None:
+            self.on_reset()
+        else:
+            reset_gesture_flag(self.match_id)
+
+    def close(self):
+        with self.lock:
+            if self.hands is not None:
+                self.hands.close()
+                self.scan_hands.close()
+                self.hands = self.scan_hands = None
+
+    def __del__(self):
+        if getattr(self, "hands", None) is not None:
+            self.close()
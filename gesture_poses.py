@@ -0,0 +1,81 @@
+# gesture_poses.py
+"""Synthetic umpire hand poses, for training the gesture model and building replay fixtures.
+
+A hand is a (21, 3) float32 array of normalized landmarks in MediaPipe
+order, drawn as a right hand facing the camera. SHAPES gives the thumb and
+finger positions of every signal, which satisfy the rules in
+landmark_classifier; NONE_SHAPES are hands that are no signal at all (odd
+finger combinations, a relaxed hand) and that the model learns to reject.
+`spread` and `length` stretch the fingers sideways and along their length,
+so different hand shapes can be drawn for training and held out for
+evaluation. POSES is every signal at the default shape.
+"""
+import numpy as np
+
+# Each finger's x and the y of its knuckle (mcp)
+FINGER_X = (0.44, 0.50, 0.56, 0.62)
+MCP_Y = 0.60
+SPREAD_CENTER = 0.53  # Fingers spread out from here
+
+# Finger joint heights (pip, dip, tip)
+UP = (0.50, 0.45, 0.40)
+DOWN = (0.55, 0.60, 0.62)
+PINCH = (0.50, 0.51, 0.505)  # Index only half raised so its tip meets the thumb
+RELAXED = (0.52, 0.52, 0.53)  # Half bent, neither raised nor curled
+
+# Thumb (ip, tip) positions
+THUMB_COUNTED = ((0.34, 0.62), (0.30, 0.60))  # Pointing away from the palm
+THUMB_TUCKED = ((0.40, 0.62), (0.47, 0.70))   # Folded under the fingers
+THUMB_SIDEWAYS = ((0.34, 0.62), (0.26, 0.58))  # Wide
+THUMB_UP = ((0.40, 0.55), (0.41, 0.45))        # No ball
+THUMB_PINCH = ((0.40, 0.55), (0.44, 0.50))     # Dot ball, tip on the index tip
+
+SHAPES = {
+    "0": (THUMB_TUCKED, (DOWN, DOWN, DOWN, DOWN)),
+    "1": (THUMB_TUCKED, (UP, DOWN, DOWN, DOWN)),
+    "2": (THUMB_TUCKED, (UP, UP, DOWN, DOWN)),
+    "3": (THUMB_TUCKED, (UP, UP, UP, DOWN)),
+    "4": (THUMB_TUCKED, (UP, UP, UP, UP)),
+    "5": (THUMB_COUNTED, (UP, UP, UP, UP)),
+    "wide": (THUMB_SIDEWAYS, (DOWN, DOWN, DOWN, DOWN)),
+    "no_ball": (THUMB_UP, (DOWN, DOWN, DOWN, DOWN)),
+    "dot_ball": (THUMB_PINCH, (PINCH, DOWN, DOWN, DOWN)),
+}
+
+NONE_SHAPES = (
+    (THUMB_TUCKED, (DOWN, UP, DOWN, DOWN)),  # Middle finger alone
+    (THUMB_TUCKED, (UP, DOWN, DOWN, UP)),    # Index and pinky
+    (THUMB_TUCKED, (DOWN, DOWN, UP, UP)),    # Ring and pinky
+    (THUMB_TUCKED, (RELAXED, RELAXED, RELAXED, RELAXED)),
+    (THUMB_COUNTED, (RELAXED, RELAXED, RELAXED, RELAXED)),
+)
+
+
+def hand(thumb, fingers, spread=1.0, length=1.0):
+    """Build one (21, 3) hand from a thumb pose and four (pip, dip, tip) finger heights"""
+    points = np.zeros((21, 3), dtype=np.float32)
+    points[0] = (0.50, 0.80, 0.0)  # Wrist
+    points[1] = (0.43, 0.72, -0.01)
+    points[2] = (0.38, 0.66, -0.02)
+    points[3, :2] = thumb[0]
+    points[4, :2] = thumb[1]
+    for i, (x, joints) in enumerate(zip(FINGER_X, fingers)):
+        mcp = 5 + i * 4
+        x = x * spread + SPREAD_CENTER * (1 - spread)
+        points[mcp, :2] = (x, MCP_Y)
+        for joint, y in enumerate(joints):
+            points[mcp + 1 + joint, :2] = (x, y * length + MCP_Y * (1 - length))
+    points[:, 2] -= 0.02 * np.arange(21) / 20
+    return points
+
+
+def rotate(points, degrees):
+    """Rotate a hand in the image plane around its wrist"""
+    angle = np.radians(degrees)
+    rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]], dtype=np.float32)
+    rotated = points.copy()
+    rotated[:, :2] = (points[:, :2] - points[0, :2]) @ rotation.T + points[0, :2]
+    return rotated
+
+
+POSES = {label: hand(*shape) for label, shape in SHAPES.items()}
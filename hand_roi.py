@@ -0,0 +1,124 @@
+# hand_roi.py
+"""Region-of-interest inference around the last known hand.
+
+Once a full-frame scan has found a hand, following frames are cropped to
+a padded square around it and downscaled to a fixed inference size, so
+MediaPipe works on a small image instead of the full 1080p frame. Landmarks
+found in the crop are mapped back to full-frame normalized coordinates.
+
+The box stays where it was placed for as long as the hand is tracked in
+it: a tracking-mode Hands session follows landmarks from frame to frame in
+its own image coordinates, so a box that moved every frame would shift
+those under it. The box is only placed again by a new full-frame scan,
+after the hand is lost or comes within EDGE_MARGIN of the crop border.
+Crops and full-frame scans can go to separate sessions (process's
+`scan_hands`), so each one always sees images of one size.
+"""
+import cv2
+import numpy as np
+
+from pipeline_timing import NO_TIMER
+
+EDGE_MARGIN = 0.03  # A hand this close to the crop border (fraction of the crop) triggers a re-scan
+
+
+class HandRoi:
+    def __init__(self, inference_size=256, padding=0.6, min_crop=128):
+        self.inference_size = inference_size  # Side of the square image sent to MediaPipe
+        self.padding = padding  # Extra margin per side, as a fraction of the hand size; room to move in the fixed box
+        self.min_crop = min_crop  # Smallest crop side in pixels
+        self.box = None  # (x0, y0, side) in full-frame pixels, or None for full-frame scans
+        self.crop_buffer = np.empty((inference_size, inference_size, 3), dtype=np.uint8)
+        self.rgb_buffer = np.empty((inference_size, inference_size, 3), dtype=np.uint8)
+        self.frame_rgb = None  # Full-frame RGB buffer, allocated for the first frame of each size
+
+    def reset(self):
+        """Forget the last hand position so the next frame is a full-frame scan"""
+        self.box = None
+
+    def update(self, hand_landmarks, width, height):
+        """Place the crop box around a hand found by a full-frame scan"""
+        xs = [lm.x for lm in hand_landmarks.landmark]
+        ys = [lm.y for lm in hand_landmarks.landmark]
+        x_min, x_max = min(xs) * width, max(xs) * width
+        y_min, y_max = min(ys) * height, max(ys) * height
+
+        hand_size = max(x_max - x_min, y_max - y_min)
+        side = int(max(hand_size * (1 + 2 * self.padding), self.min_crop))
+        side = min(side, width, height)
+
+        # Center on the hand, then shift the square back inside the frame
+        cx = (x_min + x_max) / 2
+        cy = (y_min + y_max) / 2
+        x0 = int(min(max(cx - side / 2, 0), width - side))
+        y0 = int(min(max(cy - side / 2, 0), height - side))
+        self.box = (x0, y0, side)
+
+    def crop(self, image_bgr):
+        """Cut the current box out of a BGR frame, resize it to the inference size and convert to RGB"""
+        x0, y0, side = self.box
+        region = image_bgr[y0:y0 + side, x0:x0 + side]
+        cv2.resize(region, (self.inference_size, self.inference_size),
+                   dst=self.crop_buffer, interpolation=cv2.INTER_AREA)
+        self.rgb_buffer.flags.writeable = True
+        cv2.cvtColor(self.crop_buffer, cv2.COLOR_BGR2RGB, dst=self.rgb_buffer)
+        self.rgb_buffer.flags.writeable = False  # MediaPipe then reads it without copying
+        return self.rgb_buffer
+
+    def to_rgb(self, image_bgr):
+        """Convert a full BGR frame to RGB into a buffer reused for every frame of the same size"""
+        if self.frame_rgb is None or self.frame_rgb.shape != image_bgr.shape:
+            self.frame_rgb = np.empty(image_bgr.shape, dtype=np.uint8)
+        self.frame_rgb.flags.writeable = True
+        cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB, dst=self.frame_rgb)
+        self.frame_rgb.flags.writeable = False
+        return self.frame_rgb
+
+    def map_landmarks(self, hand_landmarks, width, height):
+        """Convert landmarks from crop-normalized to full-frame-normalized coordinates, in place"""
+        x0, y0, side = self.box
+        for lm in hand_landmarks.landmark:
+            lm.x = (x0 + lm.x * side) / width
+            lm.y = (y0 + lm.y * side) / height
+            lm.z = lm.z * side / width
+
+    @staticmethod
+    def near_edge(hand_landmarks):
+        """Whether crop-normalized landmarks come within EDGE_MARGIN of the crop border"""
+        for lm in hand_landmarks.landmark:
+            if not (EDGE_MARGIN < lm.x < 1 - EDGE_MARGIN and EDGE_MARGIN < lm.y < 1 - EDGE_MARGIN):
+                return True
+        return False
+
+    def process(self, hands, image_bgr, timer=NO_TIMER, scan_hands=None):
+        """Run `hands` on the fixed ROI crop if tracking, else `scan_hands` (default `hands`) on the full frame.
+
+        Takes a BGR frame; only the pixels actually sent to MediaPipe are
+        converted to RGB. Returned landmarks are always in full-frame
+        normalized coordinates. The timer gets a "crop" or "cvtColor" lap and
+        a "hands.process" lap.
+        """
+        height, width = image_bgr.shape[:2]
+
+        if self.box is not None:
+            image_rgb = self.crop(image_bgr)
+            timer.lap("crop")
+            results = hands.process(image_rgb)
+            timer.lap("hands.process")
+            if results.multi_hand_landmarks:
+                leaving = self.near_edge(results.multi_hand_landmarks[0])
+                for hand_landmarks in results.multi_hand_landmarks:
+                    self.map_landmarks(hand_landmarks, width, height)
+                if leaving:
+                    self.box = None  # Use this frame, re-scan the full frame on the next
+                return results
+            # Tracking lost - fall back to a full-frame scan on this frame
+            self.box = None
+
+        image_rgb = self.to_rgb(image_bgr)
+        timer.lap("cvtColor")
+        results = (scan_hands or hands).process(image_rgb)
+        timer.lap("hands.process")
+        if results.multi_hand_landmarks:
+            self.update(results.multi_hand_landmarks[0], width, height)
+        return results
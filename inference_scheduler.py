@@ -0,0 +1,67 @@
+# inference_scheduler.py
+"""Adaptive frame skipping for hand inference.
+
+Gestures have to be held for seconds before they count, so running
+hands.process on every camera frame mostly burns CPU. The scheduler picks
+which frames get inference: a normal target rate, a faster rate while a
+candidate gesture is being held, and a slow idle rate once no hand has been
+seen for a while. All decisions use wall-clock timestamps, so hold timing
+does not depend on how many frames were skipped.
+"""
+import time
+
+
+class InferenceScheduler:
+    def __init__(self, target_fps=10.0, active_fps=20.0, idle_fps=3.0, idle_after=3.0):
+        self.target_fps = target_fps
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.idle_after = idle_after  # Seconds without a hand before slowing down
+
+        self.last_run = None
+        self.last_hand_time = None
+        self.holding = False
+        self.deadline = None  # Force an inference at this time (e.g. hold confirmation)
+
+    def current_fps(self, now=None):
+        """Inference rate for the current state"""
+        if now is None:
+            now = time.time()
+        if self.holding:
+            return self.active_fps
+        if self.last_hand_time is None or now - self.last_hand_time > self.idle_after:
+            return self.idle_fps
+        return self.target_fps
+
+    def should_infer(self, now=None):
+        """Return True if this frame should go through inference"""
+        if now is None:
+            now = time.time()
+        due = (self.last_run is None or
+               now - self.last_run >= 1.0 / self.current_fps(now) or
+               (self.deadline is not None and now >= self.deadline))
+        if due:
+            self.last_run = now
+            self.deadline = None
+        return due
+
+    def record(self, hand_seen, holding=False, confirm_at=None, now=None):
+        """Feed back the result of an inference frame.
+
+        hand_seen: a hand was detected on this frame
+        holding: a candidate gesture is being held towards confirmation
+        confirm_at: wall-clock time the held gesture will be confirmed, so an
+            inference is scheduled exactly then even at a low frame rate
+        """
+        if now is None:
+            now = time.time()
+        if hand_seen:
+            self.last_hand_time = now
+        self.holding = holding
+        self.deadline = confirm_at if holding and confirm_at is not None and confirm_at > now else None
+
+    def reset(self):
+        self.last_run = None
+        self.last_hand_time = None
+        self.holding = False
+        self.deadline = None
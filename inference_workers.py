@@ -0,0 +1,163 @@
+# inference_workers.py
+"""Inference off the video thread.
+
+The video path (streamlit-webrtc's recv, or a camera loop) hands each frame
+that the scheduler wants inferred to a LatestFrameQueue and returns at once
+with the last known overlay. The queue keeps at most one pending frame per
+source: a newer frame replaces an older one that no worker has picked up
+yet, so a slow inference drops frames instead of building up lag. A pool of
+worker threads takes frames off the queue and runs GesturePipeline.infer;
+one source is never processed by two workers at the same time, so hold
+timing stays in frame order. A source can also hand over a SharedFrameRing
+instead of a frame; the worker then infers on the ring's newest slot in
+place, with no copy.
+"""
+import os
+import threading
+import weakref
+
+from frame_ring import SharedFrameRing
+from score_log import WARNING, event
+
+
+class LatestFrameQueue:
+    def __init__(self, max_sources=16):
+        self.max_sources = max_sources  # Bound on pending frames (one per source)
+        self.dropped = 0  # Frames replaced or evicted before a worker took them
+        self._pending = {}  # source -> item, oldest first
+        self._busy = set()  # Sources a worker is processing right now
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, source, item):
+        """Queue the latest frame of a source; returns True if an older frame was dropped"""
+        with self._cond:
+            dropped = source in self._pending
+            if not dropped and len(self._pending) >= self.max_sources:
+                # Full - evict the frame that has waited longest
+                del self._pending[next(iter(self._pending))]
+                dropped = True
+            if dropped:
+                self.dropped += 1
+            self._pending[source] = item
+            self._cond.notify()
+            return dropped
+
+    def get(self):
+        """Take the oldest frame whose source is idle; returns (source, item), or None once closed"""
+        with self._cond:
+            while not self._closed:
+                for source in self._pending:
+                    if source not in self._busy:
+                        self._busy.add(source)
+                        return source, self._pending.pop(source)
+                self._cond.wait()
+            return None
+
+    def done(self, source):
+        """A worker finished with `source`; its next frame may now be taken"""
+        with self._cond:
+            self._busy.discard(source)
+            self._cond.notify_all()
+
+    def discard(self, source):
+        """Forget a pending frame and wait until no worker is using the source, e.g. when its stream ends"""
+        with self._cond:
+            self._pending.pop(source, None)
+            while source in self._busy and not self._closed:
+                self._cond.wait()
+
+    def depth(self):
+        return len(self._pending)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+
+
+class InferenceWorkers:
+    def __init__(self, workers=1, max_sources=16):
+        self.queue = LatestFrameQueue(max_sources)
+        self.processed = 0
+        self.errors = 0
+        self._counts_lock = threading.Lock()  # Workers update processed/errors concurrently
+        self._ring_seq = weakref.WeakKeyDictionary()  # ring -> sequence number of the last frame inferred
+        self._threads = [threading.Thread(target=self._run, name=f"inference-{i}", daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, pipeline, frame, now):
+        """Queue a frame for pipeline.infer; returns True if this replaced a frame the workers had not reached yet.
+
+        `frame` is either a BGR array the caller must not write to afterwards,
+        or a SharedFrameRing whose newest published slot is read when a
+        worker gets to it.
+        """
+        dropped = self.queue.put(pipeline, (frame, now))
+        if dropped:
+            pipeline.timer.count("dropped")
+        return dropped
+
+    def forget(self, pipeline):
+        """Drop any queued frame of a pipeline that is being closed; returns once no worker is using it"""
+        self.queue.discard(pipeline)
+
+    def stats(self):
+        with self._counts_lock:
+            processed, errors = self.processed, self.errors
+        return {"workers": len(self._threads), "queue_depth": self.queue.depth(),
+                "dropped": self.queue.dropped, "processed": processed, "errors": errors}
+
+    def close(self):
+        self.queue.close()
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            pipeline, (frame, now) = job
+            try:
+                pipeline.timer.begin()
+                if isinstance(frame, SharedFrameRing):
+                    self._infer_ring(pipeline, frame)
+                else:
+                    pipeline.infer(frame, now)
+                pipeline.timer.end()
+                with self._counts_lock:
+                    self.processed += 1
+            except Exception as e:
+                # One bad frame must not take the worker down with it
+                with self._counts_lock:
+                    self.errors += 1
+                event(WARNING, "inference_error", exc_info=True, match=pipeline.match_id, error=repr(e))
+            finally:
+                self.queue.done(pipeline)
+
+    def _infer_ring(self, pipeline, ring):
+        slot, seq, stamp, image_bgr = ring.read_latest(self._ring_seq.get(ring, 0))
+        if image_bgr is None:
+            return  # Already inferred on the newest frame
+        try:
+            self._ring_seq[ring] = seq
+            pipeline.infer(image_bgr, stamp)
+        finally:
+            ring.release()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_workers():
+    """Process-wide pool for every camera stream; INFERENCE_WORKERS sets its size (default 1)"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = InferenceWorkers(int(os.environ.get("INFERENCE_WORKERS", "1")))
+        return _shared
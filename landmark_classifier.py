@@ -0,0 +1,97 @@
+# landmark_classifier.py
+"""Vectorized gesture rules over MediaPipe hand landmarks.
+
+A hand is a (21, 3) float32 array of normalized (x, y, z) landmarks in
+MediaPipe order; a batch is (N, 21, 3). Every finger flag and distance is
+computed in one NumPy pass, so replays can classify thousands of hands per call.
+A single hand, the live per-frame case, takes a plain-Python path with the
+same rules instead, since NumPy's per-call overhead dwarfs 21 points.
+"""
+import numpy as np
+
+# MediaPipe hand landmark indices
+THUMB_IP = 3
+THUMB_TIP = 4
+INDEX_FINGER_TIP = 8
+FINGER_TIPS = (8, 12, 16, 20)  # index, middle, ring, pinky
+FINGER_PIPS = tuple(tip - 2 for tip in FINGER_TIPS)
+
+# Rule thresholds (normalized image coordinates)
+PINCH_DISTANCE = 0.05       # Thumb and index tips closer than this = pinch
+THUMB_VERTICAL_MARGIN = 0.05  # Max thumb x-offset for a vertical thumbs up
+
+# Gesture codes returned by classify_batch
+NO_GESTURE, DOT_BALL, NO_BALL, WIDE = range(4)
+GESTURE_LABELS = (None, "dot_ball", "no_ball", "wide")
+
+
+def landmarks_to_array(hand_landmarks, out=None):
+    """Convert a MediaPipe hand landmark list into a (21, 3) float32 array"""
+    points = np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+    if out is None:
+        return points
+    out[...] = points
+    return out
+
+
+def classify_batch(points):
+    """Classify a (N, 21, 3) batch of hands.
+
+    Returns (codes, fingers): int8 gesture codes indexing GESTURE_LABELS and
+    int8 finger counts, which are -1 wherever a special gesture was found.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    x = points[:, :, 0]
+    y = points[:, :, 1]
+
+    tip_y = y[:, FINGER_TIPS]
+    pip_y = y[:, FINGER_PIPS]
+    fingers_up = tip_y < pip_y
+    fingers_down = tip_y > pip_y
+    all_down = fingers_down.all(axis=1)
+    others_down = fingers_down[:, 1:].all(axis=1)  # middle, ring, pinky
+
+    thumb_dx = x[:, THUMB_TIP] - x[:, THUMB_IP]
+    thumb_dy = y[:, THUMB_TIP] - y[:, THUMB_IP]
+    pinch_distance = np.hypot(x[:, THUMB_TIP] - x[:, INDEX_FINGER_TIP],
+                              y[:, THUMB_TIP] - y[:, INDEX_FINGER_TIP])
+
+    pinch = (pinch_distance < PINCH_DISTANCE) & others_down
+    thumb_out = (thumb_dy < 0) & all_down
+    thumb_up = thumb_out & (np.abs(thumb_dx) < THUMB_VERTICAL_MARGIN)
+
+    # Priority order matches the original rules: pinch, thumbs up, thumb out
+    codes = np.select([pinch, thumb_up, thumb_out], [DOT_BALL, NO_BALL, WIDE], NO_GESTURE).astype(np.int8)
+    fingers = (thumb_dx < 0).astype(np.int8) + fingers_up.sum(axis=1, dtype=np.int8)
+    fingers[codes != NO_GESTURE] = -1
+    return codes, fingers
+
+
+def classify_landmarks(points):
+    """Classify one (21, 3) hand, or a (N, 21, 3) batch.
+
+    For a single hand returns (label, finger_count): label is one of
+    "dot_ball", "no_ball", "wide" with finger_count None, or None with the
+    finger count. Batches are passed through to classify_batch.
+    """
+    if isinstance(points, np.ndarray):
+        if points.ndim == 3:
+            return classify_batch(points)
+        points = points.tolist()
+    return _classify_hand(points)
+
+
+def _classify_hand(points):
+    """classify_landmarks for one hand given as 21 (x, y, z) sequences, without NumPy"""
+    thumb_x, thumb_y = points[THUMB_TIP][0], points[THUMB_TIP][1]
+    ip_x, ip_y = points[THUMB_IP][0], points[THUMB_IP][1]
+    index_x, index_y = points[INDEX_FINGER_TIP][0], points[INDEX_FINGER_TIP][1]
+    up = [points[tip][1] < points[tip - 2][1] for tip in FINGER_TIPS]
+    down = [points[tip][1] > points[tip - 2][1] for tip in FINGER_TIPS]
+    others_down = down[1] and down[2] and down[3]
+
+    if others_down and ((thumb_x - index_x) ** 2 + (thumb_y - index_y) ** 2) ** 0.5 < PINCH_DISTANCE:
+        return "dot_ball", None
+    if thumb_y < ip_y and others_down and down[0]:
+        return ("no_ball" if abs(thumb_x - ip_x) < THUMB_VERTICAL_MARGIN else "wide"), None
+    return None, (thumb_x < ip_x) + up[0] + up[1] + up[2] + up[3]
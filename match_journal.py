@@ -0,0 +1,147 @@
+# match_journal.py
+"""Durable append-only journal for one match.
+
+Every change to a ScoreEngine is written as one JSON line. Writes are
+queued and a background thread appends them in batches with a single fsync
+per batch, so update_score never waits on the disk. Every so often the
+engine hands over a full snapshot; the writer stores it atomically and
+truncates the journal, so recovery is "load snapshot + replay a short tail"
+however long the match has been running.
+
+Records carry a sequence number and a snapshot stores the last one it
+covers, so records the snapshot already contains are skipped on load,
+e.g. after a crash between storing a snapshot and truncating the journal.
+A journal is locked to one process for as long as it is open.
+"""
+import json
+import os
+import re
+import threading
+from collections import deque
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, one scoring process per journal is up to the user
+    fcntl = None
+
+
+class JournalLocked(RuntimeError):
+    """The journal is open in another process"""
+
+
+class MatchJournal:
+    def __init__(self, directory, match_id, flush_interval=0.2):
+        os.makedirs(directory, exist_ok=True)
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", str(match_id))
+        self.path = os.path.join(directory, f"{name}.journal")
+        self.snapshot_path = os.path.join(directory, f"{name}.snapshot.json")
+        self.flush_interval = flush_interval  # Max time a record waits before fsync
+
+        self._pending = deque()  # ("record", dict) or ("snapshot", dict), in order
+        self._cond = threading.Condition()
+        self._closed = False
+        self._file = open(self.path, "a", encoding="utf-8")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._file.close()
+                raise JournalLocked(f"{self.path} is in use by another process")
+        # Read once; the first load() (recovery) hands these over instead of reading the files again
+        self._loaded = snapshot, records = self._read()
+        # Continue numbering after everything already on disk
+        self._seq = max([snapshot.get("seq", 0) if snapshot else 0] + [r.get("seq", 0) for r in records])
+        self._thread = threading.Thread(target=self._run, name=f"journal-{name}", daemon=True)
+        self._thread.start()
+
+    def append(self, record):
+        """Queue one journal record; returns immediately"""
+        with self._cond:
+            self._seq += 1
+            self._pending.append(("record", dict(record, seq=self._seq)))
+            self._cond.notify()
+
+    def write_snapshot(self, snapshot):
+        """Queue a full snapshot covering every record appended so far; the journal is truncated once it is on disk"""
+        with self._cond:
+            self._pending.append(("snapshot", dict(snapshot, seq=self._seq)))
+            self._cond.notify()
+
+    def load(self):
+        """Return (snapshot or None, records written after it)"""
+        loaded, self._loaded = self._loaded, None
+        return loaded if loaded is not None else self._read()
+
+    def _read(self):
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+
+        records = []
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        break  # Torn write from a crash; everything after it is lost anyway
+        if snapshot is not None:
+            # Records from before "seq" existed have none and are all newer than the snapshot
+            covered = snapshot.get("seq", 0)
+            records = [r for r in records if r.get("seq", covered + 1) > covered]
+        return snapshot, records
+
+    def close(self):
+        """Flush everything still queued and stop the writer thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self._file.close()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._closed:
+                    # Give concurrent deliveries a moment to join this batch
+                    self._cond.wait(self.flush_interval)
+                batch = list(self._pending)
+                self._pending.clear()
+                closed = self._closed
+            self._write(batch)
+            if closed:
+                return
+
+    def _write(self, batch):
+        lines = []
+        for kind, item in batch:
+            if kind == "record":
+                lines.append(json.dumps(item, separators=(",", ":")) + "\n")
+            else:
+                self._flush(lines)
+                lines = []
+                self._store_snapshot(item)
+        self._flush(lines)
+
+    def _flush(self, lines):
+        if not lines:
+            return
+        self._file.write("".join(lines))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _store_snapshot(self, snapshot):
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        # Everything journaled so far is covered by the snapshot
+        self._file.truncate(0)
+        self._file.seek(0)
+        self._file.flush()
+        os.fsync(self._file.fileno())
@@ -0,0 +1,272 @@
+# multi_camera.py
+"""Score from several cameras at once, with inference in worker processes.
+
+Usage:
+    python multi_camera.py SOURCE [SOURCE ...] [--workers N] [--match ID] [--show]
+
+A source is a camera index, a video file or a stream URL. Each one is
+decoded on its own thread in this process and written into a
+SharedFrameRing; worker processes (each source pinned to one, so Hands
+tracking and hold timing stay with it) read the newest frame straight out
+of shared memory and run the usual GesturePipeline. Only small messages
+come back: overlays for display and confirmed gestures, which a single
+consumer thread here merges across workers in capture-time order before
+calling update_score. A frame whose inference fails is counted and logged,
+and a worker that exits stops holding back the merge.
+"""
+import argparse
+import heapq
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from frame_ring import SharedFrameRing
+from score_log import INFO, WARNING, event
+
+
+def parse_source(source):
+    """Camera indices arrive as strings on the command line"""
+    return int(source) if str(source).isdigit() else source
+
+
+def inference_worker(worker_id, rings, match_ids, results, new_frame, stop, confirmation_delay):
+    """Worker process: run one GesturePipeline per assigned source"""
+    os.environ["SCORE_JOURNAL_DIR"] = ""  # Scoring happens in the parent; never touch its journals
+    from gesture_pipeline import GesturePipeline
+    from landmark_classifier import landmarks_to_array
+
+    clock = {}  # source -> capture time of the frame being inferred
+
+    def make_pipeline(source):
+        return GesturePipeline(
+            match_ids[source], confirmation_delay,
+            on_confirm=lambda gesture: results.put(("confirm", worker_id, clock[source], source, gesture)),
+            on_reset=lambda: results.put(("reset", worker_id, clock[source], source, None)))
+
+    pipelines = {source: make_pipeline(source) for source in rings}
+    last_seq = dict.fromkeys(rings, 0)
+    try:
+        while not stop.is_set():
+            new_frame.wait(0.1)
+            new_frame.clear()
+            watermark = float("inf")
+            for source, ring in rings.items():
+                slot, seq, stamp, view = ring.read_latest(last_seq[source])
+                if view is not None:
+                    try:
+                        last_seq[source] = seq
+                        pipeline = pipelines[source]
+                        if pipeline.should_infer(stamp):
+                            clock[source] = stamp
+                            pipeline.infer(view, stamp)
+                            landmarks = pipeline.last_landmarks
+                            results.put(("overlay", worker_id, stamp, source,
+                                         (None if landmarks is None else landmarks_to_array(landmarks),
+                                          pipeline.last_overlay)))
+                    except Exception as e:
+                        # One bad frame must not take the worker down with it
+                        event(WARNING, "inference_error", exc_info=True, source=source, error=repr(e))
+                        results.put(("error", worker_id, stamp, source, None))
+                    finally:
+                        ring.release()
+                # Nothing older than this can come from this source any more
+                watermark = min(watermark, stamp)
+            results.put(("watermark", worker_id, watermark, None, None))
+    finally:
+        results.put(("exit", worker_id, None, None, None))
+        for pipeline in pipelines.values():
+            pipeline.close()
+        for ring in rings.values():
+            ring.close()
+
+
+class MultiCamera:
+    def __init__(self, sources, match_ids=None, workers=None, confirmation_delay=1.0,
+                 slots=3, realtime=True, show=False):
+        self.sources = [parse_source(source) for source in sources]
+        self.match_ids = match_ids or {}  # source -> match id, default match otherwise
+        self.workers = min(workers or os.cpu_count() or 1, len(self.sources))
+        self.confirmation_delay = confirmation_delay
+        self.slots = slots
+        self.realtime = realtime  # Pace video files at their own frame rate, like a live feed
+        self.show = show
+
+        self.context = multiprocessing.get_context("spawn")  # MediaPipe is not fork-safe
+        self.results = self.context.Queue()
+        self.stop_event = self.context.Event()
+        self.captured = dict.fromkeys(self.sources, 0)
+        self.inferred = dict.fromkeys(self.sources, 0)
+        self.errors = dict.fromkeys(self.sources, 0)  # Frames whose inference raised
+        self.confirmed = []  # (capture time, source, gesture), in scoring order
+        self.overlays = {}  # source -> (landmarks array or None, overlay entries)
+        self.frames = {}  # source -> last captured frame, for display
+        self._threads = []
+        self._processes = []
+
+    def run(self):
+        """Capture, infer and score until every source ends, stop() is called or q is pressed"""
+        import cv2
+        from score_state import DEFAULT_MATCH_ID, reset_gesture_flag, update_score
+
+        captures, rings = {}, {}
+        for source in self.sources:
+            cap = cv2.VideoCapture(source)
+            ret, frame = cap.read()
+            if not ret:
+                raise RuntimeError(f"Cannot read from source {source!r}")
+            captures[source] = (cap, frame)
+            rings[source] = SharedFrameRing(frame.shape, self.slots, lock=self.context.Lock())
+        match_ids = {source: self.match_ids.get(source, DEFAULT_MATCH_ID) for source in self.sources}
+
+        # Pin each source to one worker so tracking and hold state stay in one process
+        assignments = [self.sources[i::self.workers] for i in range(self.workers)]
+        events = [self.context.Event() for _ in assignments]
+        for worker_id, assigned in enumerate(assignments):
+            process = self.context.Process(
+                target=inference_worker, name=f"inference-{worker_id}", daemon=True,
+                args=(worker_id, {s: rings[s] for s in assigned}, {s: match_ids[s] for s in assigned},
+                      self.results, events[worker_id], self.stop_event, self.confirmation_delay))
+            process.start()
+            self._processes.append(process)
+        worker_of = {source: events[i] for i, assigned in enumerate(assignments) for source in assigned}
+
+        def score(kind, source, gesture):
+            if kind == "confirm":
+                update_score(gesture, match_ids[source])
+            else:
+                reset_gesture_flag(match_ids[source])
+
+        for source in self.sources:
+            cap, frame = captures[source]
+            thread = threading.Thread(target=self._capture, name=f"capture-{source}", daemon=True,
+                                      args=(source, cap, frame, rings[source], worker_of[source], cv2))
+            thread.start()
+            self._threads.append(thread)
+        consumer = threading.Thread(target=self._consume, args=(score,), name="score-consumer", daemon=True)
+        consumer.start()
+
+        try:
+            while any(thread.is_alive() for thread in self._threads) and not self.stop_event.is_set():
+                if self.show:
+                    self._display(cv2)
+                else:
+                    time.sleep(0.1)
+        finally:
+            self.stop()
+            for process in self._processes:
+                process.join(5)
+            consumer.join(5)
+            for ring in rings.values():
+                ring.close()
+            if self.show:
+                cv2.destroyAllWindows()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def stats(self):
+        return {"captured": dict(self.captured), "inferred": dict(self.inferred), "errors": dict(self.errors),
+                "confirmed": len(self.confirmed), "workers": self.workers}
+
+    def _capture(self, source, cap, first_frame, ring, new_frame, cv2):
+        """Decode one source into its ring; the first frame was read to size the ring"""
+        interval = 1.0 / (cap.get(cv2.CAP_PROP_FPS) or 30.0) if self.realtime and not isinstance(source, int) else 0
+        frame = first_frame
+        next_time = time.time()
+        try:
+            while not self.stop_event.is_set():
+                slot, buffer = ring.write_slot()
+                if frame is None:
+                    # Decode straight into shared memory when the frame size allows it
+                    ret, frame = cap.read(buffer)
+                    if not ret:
+                        break
+                if frame.ctypes.data != buffer.ctypes.data:
+                    buffer[...] = frame
+                frame = None
+                ring.publish(slot)
+                self.frames[source] = buffer
+                self.captured[source] += 1
+                new_frame.set()
+                if interval:
+                    next_time += interval
+                    time.sleep(max(0.0, next_time - time.time()))
+        finally:
+            cap.release()
+
+    def _consume(self, score):
+        """Merge worker messages into capture-time order and score them on this one thread"""
+        watermarks = dict.fromkeys(range(self.workers), float("-inf"))
+        pending = []  # heap of (capture time, tiebreak, kind, source, gesture)
+        tiebreak = itertools.count()
+        while True:
+            try:
+                kind, worker_id, stamp, source, payload = self.results.get(timeout=0.1)
+            except queue.Empty:
+                if self.stop_event.is_set() and not any(p.is_alive() for p in self._processes):
+                    break
+                # A worker that died without saying so must not hold everyone else back
+                for worker_id, process in enumerate(self._processes):
+                    if worker_id in watermarks and process.exitcode is not None:
+                        del watermarks[worker_id]
+                kind = None
+            if kind == "overlay":
+                self.overlays[source] = payload
+                self.inferred[source] += 1
+            elif kind == "error":
+                self.errors[source] += 1
+            elif kind == "watermark":
+                if worker_id in watermarks:
+                    watermarks[worker_id] = max(watermarks[worker_id], stamp)
+            elif kind == "exit":
+                watermarks.pop(worker_id, None)
+            elif kind is not None:
+                heapq.heappush(pending, (stamp, next(tiebreak), kind, source, payload))
+            # Every live worker has moved past this time, so nothing earlier can still arrive
+            safe = min(watermarks.values(), default=float("inf"))
+            while pending and pending[0][0] <= safe:
+                self._score(score, *heapq.heappop(pending))
+        # Workers are gone and the queue is drained; whatever is left is final
+        while pending:
+            self._score(score, *heapq.heappop(pending))
+
+    def _score(self, score, stamp, tiebreak, kind, source, gesture):
+        score(kind, source, gesture)
+        if kind == "confirm":
+            self.confirmed.append((stamp, source, gesture))
+            event(INFO, "camera_confirmed", source=source, gesture=gesture)
+
+    def _display(self, cv2):
+        for source in self.sources:
+            frame = self.frames.get(source)
+            if frame is None:
+                continue
+            image = frame.copy()
+            height, width = image.shape[:2]
+            landmarks, overlay = self.overlays.get(source, (None, []))
+            if landmarks is not None:
+                for x, y, _ in landmarks:
+                    cv2.circle(image, (int(x * width), int(y * height)), 3, (0, 255, 0), -1)
+            for text, org, scale, color, thickness in overlay:
+                cv2.putText(image, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+            cv2.imshow(f"Camera {source}", image)
+        if cv2.waitKey(30) & 0xFF == ord("q"):
+            self.stop()
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SCORE_JOURNAL_DIR", "match_journals")  # The scoring process journals its matches
+    parser = argparse.ArgumentParser(description="Multi-camera gesture scoring")
+    parser.add_argument("sources", nargs="+", help="Camera index, video file or stream URL")
+    parser.add_argument("--workers", type=int, default=None, help="Inference processes (default: one per core)")
+    parser.add_argument("--match", default=None, help="Match id every source scores")
+    parser.add_argument("--delay", type=float, default=1.0, help="Seconds a gesture must be held")
+    parser.add_argument("--show", action="store_true", help="Show every feed with its overlay")
+    args = parser.parse_args()
+    cameras = MultiCamera(args.sources, workers=args.workers, confirmation_delay=args.delay, show=args.show,
+                          match_ids={parse_source(s): args.match for s in args.sources} if args.match else None)
+    cameras.run()
+    event(INFO, "multi_camera_stats", **cameras.stats())
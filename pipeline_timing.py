@@ -0,0 +1,170 @@
+# pipeline_timing.py
+"""Per-stage latency timing for the frame pipelines.
+
+A pipeline calls begin() when a frame arrives, lap("stage") right after
+each stage and end() when the frame leaves; each lap records the time since
+the previous mark into a fixed-size rolling window per stage. stats() gives
+p50/p95/p99 in milliseconds plus event counters (skipped frames, frames
+over budget), for code in the same process or the on-screen debug overlay.
+Each stream gets a timer of its own from new_timer, since laps are marks
+on one frame at a time; pipeline_stats() merges the timers of a group,
+such as every stream of one match, when reporting.
+
+Timing is off unless PIPELINE_TIMING is set ("1" to collect, "overlay" to
+also draw the numbers on the video). While off every hook returns after a
+single attribute check.
+"""
+import itertools
+import os
+import threading
+import time
+
+import numpy as np
+
+_MODE = os.environ.get("PIPELINE_TIMING", "").lower()
+
+
+class StageTimer:
+    def __init__(self, name, window=300, budget=1 / 30, enabled=None, overlay=None, group=None):
+        self.name = name
+        self.group = name if group is None else group  # pipeline_stats() merges timers of one group
+        self.window = window  # Samples kept per stage
+        self.budget = budget  # Seconds per frame before the camera starts dropping frames
+        self.enabled = _MODE in ("1", "true", "on", "overlay") if enabled is None else enabled
+        self.overlay = _MODE == "overlay" if overlay is None else overlay
+
+        self.samples = {}  # stage -> float64 ring buffer of seconds
+        self.counts = {}  # stage -> samples recorded so far
+        self.events = {}  # counter name -> count
+        self._start = 0.0
+        self._mark = 0.0
+        self._overlay_lines = []
+        self._overlay_time = 0.0
+
+    def begin(self):
+        """A frame entered the pipeline"""
+        if not self.enabled:
+            return
+        self._start = self._mark = time.perf_counter()
+
+    def lap(self, stage):
+        """Record the time since the previous mark as one sample of `stage`"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._record(stage, now - self._mark)
+        self._mark = now
+
+    def end(self):
+        """The frame left the pipeline; records the total and counts frames over budget"""
+        if not self.enabled:
+            return
+        total = time.perf_counter() - self._start
+        self._record("total", total)
+        if total > self.budget:
+            self.count("over_budget")
+
+    def count(self, event):
+        """Bump an event counter such as skipped or over_budget"""
+        if not self.enabled:
+            return
+        self.events[event] = self.events.get(event, 0) + 1
+
+    def _record(self, stage, seconds):
+        buffer = self.samples.get(stage)
+        if buffer is None:
+            buffer = self.samples[stage] = np.zeros(self.window)
+            self.counts[stage] = 0
+        buffer[self.counts[stage] % self.window] = seconds
+        self.counts[stage] += 1
+
+    def window_samples(self):
+        """stage -> (seconds still in the rolling window, samples recorded so far)"""
+        return {stage: (buffer[:min(self.counts[stage], self.window)], self.counts[stage])
+                for stage, buffer in list(self.samples.items())}
+
+    def stats(self):
+        """Rolling p50/p95/p99/max in ms and sample count per stage, plus the event counters"""
+        return merged_stats([self])
+
+    def overlay_lines(self, refresh=0.5):
+        """Debug overlay entries (text, org, scale, color, thickness), recomputed every `refresh` seconds"""
+        if not (self.enabled and self.overlay):
+            return []
+        now = time.perf_counter()
+        if now - self._overlay_time >= refresh:
+            self._overlay_time = now
+            stats = self.stats()
+            lines = [f"{stage}: {s['p50']:.1f}/{s['p95']:.1f}/{s['p99']:.1f} ms"
+                     for stage, s in stats["stages"].items()]
+            lines.append("  ".join(f"{event}: {n}" for event, n in stats["events"].items()))
+            self._overlay_lines = [(line, (10, 110 + 18 * i), 0.45, (255, 255, 255), 1)
+                                   for i, line in enumerate(lines)]
+        return self._overlay_lines
+
+    def reset(self):
+        self.samples = {}
+        self.counts = {}
+        self.events = {}
+
+
+def merged_stats(stage_timers):
+    """stats() over the samples and event counters of several timers together"""
+    windows, counts, events = {}, {}, {}
+    for timer in stage_timers:
+        for stage, (values, n) in timer.window_samples().items():
+            windows.setdefault(stage, []).append(values)
+            counts[stage] = counts.get(stage, 0) + n
+        for event, n in list(timer.events.items()):
+            events[event] = events.get(event, 0) + n
+    stages = {}
+    for stage, parts in windows.items():
+        values = np.concatenate(parts) * 1000.0
+        if not len(values):
+            continue
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        stages[stage] = {"p50": float(p50), "p95": float(p95), "p99": float(p99),
+                         "max": float(values.max()), "n": counts[stage]}
+    return {"stages": stages, "events": events}
+
+
+# Default for code paths that are not being timed
+NO_TIMER = StageTimer("disabled", enabled=False, overlay=False)
+
+timers = {}
+_timers_lock = threading.Lock()
+_timer_ids = itertools.count(1)
+
+
+def get_timer(name, **kwargs):
+    """Shared timer for a pipeline that runs once per process, created on first use"""
+    with _timers_lock:
+        timer = timers.get(name)
+        if timer is None:
+            timer = timers[name] = StageTimer(name, **kwargs)
+        return timer
+
+
+def new_timer(group, **kwargs):
+    """A timer of its own for one stream, reported with the rest of `group`; release it when done"""
+    with _timers_lock:
+        timer = StageTimer(f"{group}#{next(_timer_ids)}", group=group, **kwargs)
+        timers[timer.name] = timer
+        return timer
+
+
+def release_timer(timer):
+    """Stop reporting a timer from new_timer"""
+    with _timers_lock:
+        timers.pop(timer.name, None)
+
+
+def pipeline_stats():
+    """Merged stats of every timer group in this process (e.g. all streams of a match)"""
+    with _timers_lock:
+        current = list(timers.values())
+    groups = {}
+    for timer in current:
+        if timer.enabled:
+            groups.setdefault(timer.group, []).append(timer)
+    return {group: merged_stats(members) for group, members in groups.items()}
@@ -0,0 +1,122 @@
+# score_log.py
+"""Structured, level-gated event log for the score engine.
+
+Each event is a name plus key=value fields (`delivery innings=1 ball=4
+runs=27 ...`). event() returns at once when the level is disabled, and the
+message text is only built when a handler emits the record. Records go
+through a bounded queue to a listener thread that does the formatting and
+the writing, so the thread that scored the delivery never waits on stdout.
+If the queue is full the record is dropped and counted rather than
+blocking.
+
+The level comes from SCORE_LOG_LEVEL (default INFO: one record per
+delivery, undo and reset). DEBUG adds ignored gestures and a full state
+dump after every change; check debug_enabled() before building one.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+DEBUG, INFO, WARNING = logging.DEBUG, logging.INFO, logging.WARNING
+
+logger = logging.getLogger("score")
+
+QUEUE_SIZE = 10000  # Records waiting for the listener before new ones are dropped
+
+
+class Event:
+    """Log message of an event and its fields, formatted on first str()"""
+
+    __slots__ = ("name", "fields", "_text")
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            self._text = " ".join([self.name] + [f"{key}={value}" for key, value in self.fields.items()])
+        return self._text
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener unformatted and never blocks the caller"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # The stock prepare() formats here, on the caller's thread; Event fields are
+        # immutable values, so formatting can wait for the listener
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_handler = None
+_listener = None
+
+
+def configure(level=None, stream=None):
+    """Send score events through the queue to `stream` (default stderr) at `level`.
+
+    `level` defaults to SCORE_LOG_LEVEL. Calling again replaces the previous
+    setup, e.g. to change the level or the stream.
+    """
+    global _handler, _listener
+    if level is None:
+        level = os.environ.get("SCORE_LOG_LEVEL", "INFO")
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = INFO
+    shutdown()
+    output = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    _handler = _QueueHandler(queue.Queue(QUEUE_SIZE))
+    _listener = logging.handlers.QueueListener(_handler.queue, output)
+    _listener.start()
+    logger.addHandler(_handler)
+    logger.setLevel(level)
+    logger.propagate = False  # The queue is the only path out; no second, synchronous copy via root
+
+
+def shutdown():
+    """Write out queued records and stop the listener thread"""
+    global _handler, _listener
+    if _listener is not None:
+        _listener.stop()
+        logger.removeHandler(_handler)
+        _handler = _listener = None
+
+
+atexit.register(shutdown)
+
+
+def dropped():
+    """Records dropped because the queue was full"""
+    return _handler.dropped if _handler is not None else 0
+
+
+def debug_enabled():
+    return logger.isEnabledFor(DEBUG)
+
+
+def event(level, name, exc_info=None, **fields):
+    """Log event `name` with its fields if `level` is enabled; pass exc_info=True inside an except block for the traceback"""
+    if logger.isEnabledFor(level):
+        if exc_info is True:
+            exc_info = sys.exc_info()
+        # makeRecord + handle instead of logger.log skips the caller's file and line lookup,
+        # which is most of the cost of a record; events are identified by name instead
+        logger.handle(logger.makeRecord(logger.name, level, "score_log", 0, Event(name, fields), None, exc_info or None,
+                                        extra={"event": name, "fields": fields}))
@@ -237,340 +237,637 @@
 
 # score_state.py
 import streamlit as st
+import os
+import threading
 import time
-
-# Global state dictionary
-state = {
-    "runs": 0,
-    "wickets": 0,
-    "balls": 0,  # Legal balls in current over (0-5)
-    "extras": 0,  # Track extras separately
-    "wides": 0,
-    "noballs": 0,
-    "byes": 0,
-    "legbyes": 0,
-    "last_updated_figures": None,
-    "last_action": "Match Started",
-    "ball_by_ball": [],
-    "last_gesture_time": 0,
-    "cooldown_period": 3.0,  # Reduced to 3 seconds cooldown
-    "free_hit": False,  # Track if next ball is a free hit
-    "innings": 1,  # Current innings (1 or 2)
-    "first_innings_score": 0,
-    "first_innings_wickets": 0,
-    "first_innings_balls": 0,
-    "match_overs": 20,  # Will be set from session state
-    "match_complete": False,
-    "winner": None
-}
-
-def get_score():
-    """Get current match score"""
-    overs = state["balls"] // 6
-    balls_in_over = state["balls"] % 6
-    
-    # Calculate remaining cooldown time
-    current_time = time.time()
-    time_since_last = current_time - state["last_gesture_time"]
-    cooldown_remaining = max(0, state["cooldown_period"] - time_since_last)
+from collections import namedtuple
+
+from delivery_rules import OUTCOMES, SET_FREE_HIT, USE_FREE_HIT
+from delivery_store import Delivery, DeliveryStore
+from match_journal import JournalLocked, MatchJournal
+import score_log
+from score_log import DEBUG, INFO, WARNING, debug_enabled, event
+
+# Immutable view of the match handed to readers (UI loop, overlays)
+ScoreSnapshot = namedtuple("ScoreSnapshot", [
+    "runs", "wickets", "balls", "extras", "wides", "noballs", "byes", "legbyes",
+    "last_action", "ball_by_ball", "last_gesture_time", "cooldown_period", "free_hit",
+    "innings", "first_innings_score", "first_innings_wickets", "first_innings_balls",
+    "match_overs", "match_complete", "winner", "stats",
+])
+
+# Derived statistics, computed once per published change rather than per render.
+# Rates are per over; required_rate, target and need are None in the first innings
+MatchStats = namedtuple("MatchStats", [
+    "run_rate", "required_rate", "target", "need", "balls_left", "projected_score",
+    "over_runs", "this_over", "partnership_runs", "partnership_balls",
+    "fours", "sixes", "dot_balls", "dot_percent",
+])
+
+
+# Gestures update_score knows how to score
+SCORING_GESTURES = tuple(OUTCOMES)  # Umpire gestures plus combined outcomes like "NB+4", see delivery_rules
+
+def new_match_state(match_overs=20, cooldown_period=3.0):
+    """Fresh state dictionary for a match"""
+    return {
+        "runs": 0,
+        "wickets": 0,
+        "balls": 0,  # Legal balls in current innings
+        "extras": 0,  # Track extras separately
+        "wides": 0,
+        "noballs": 0,
+        "byes": 0,
+        "legbyes": 0,
+        "last_updated_figures": None,
+        "last_action": "Match Started",
+        "innings_start": 0,  # Index of the current innings' first delivery in the ball log
+        "last_gesture_time": 0,
+        "cooldown_period": cooldown_period,  # Reduced to 3 seconds cooldown
+        "free_hit": False,  # Track if next ball is a free hit
+        "innings": 1,  # Current innings (1 or 2)
+        "first_innings_score": 0,
+        "first_innings_wickets": 0,
+        "first_innings_balls": 0,
+        "match_overs": match_overs,  # Will be set from session state
+        "match_complete": False,
+        "winner": None,
+        # Running counters for MatchStats, kept up to date by every delivery
+        "over_runs": (),  # Runs in each completed over of this innings
+        "this_over": 0,  # Runs so far in the current over
+        "partnership_runs": 0,  # Since the last wicket
+        "partnership_balls": 0,
+        "fours": 0,
+        "sixes": 0,
+        "dot_balls": 0,  # Legal balls with nothing scored
+    }
+
+def derive_stats(state):
+    """MatchStats from the running counters; constant time whatever the length of the innings"""
+    balls = state["balls"]
+    balls_left = max(0, state["match_overs"] * 6 - balls)
+    run_rate = round(state["runs"] * 6 / balls, 2) if balls else 0.0
+    target = need = required_rate = None
+    if state["innings"] == 2:
+        target = state["first_innings_score"] + 1
+        need = target - state["runs"]
+        required_rate = round(max(need, 0) * 6 / balls_left, 2) if balls_left else None
+    return MatchStats(
+        run_rate, required_rate, target, need, balls_left,
+        state["runs"] + round(run_rate * balls_left / 6),  # Current rate for the rest of the innings
+        state["over_runs"], state["this_over"], state["partnership_runs"], state["partnership_balls"],
+        state["fours"], state["sixes"], state["dot_balls"],
+        round(100.0 * state["dot_balls"] / balls, 1) if balls else 0.0)
+
+# Score events go through score_log's queue unless the app has set up the "score" logger itself
+if not score_log.logger.handlers:
+    score_log.configure()
+
+# Journal changes between full snapshots; bounds the tail replayed on recovery
+SNAPSHOT_EVERY = 50
+
+# Key order of the state dictionary, used to store undo records as plain tuples
+STATE_KEYS = tuple(new_match_state())
+
+class ScoreEngine:
+    """Owns the match state.
+
+    Every mutation runs under one lock and finishes by publishing a new
+    ScoreSnapshot. Readers only ever see a complete snapshot, so runs and
+    balls from the same delivery always arrive together.
+    """
+
+    __slots__ = ("_lock", "_changed", "_version", "_state", "_deliveries", "_undo_stack", "_snapshot",
+                 "_journal", "_journal_count", "_listeners", "_ball_by_ball")
+
+    def __init__(self, match_overs=20, cooldown_period=3.0):
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)  # Notified on every publish
+        self._version = 0
+        self._state = new_match_state(match_overs, cooldown_period)
+        self._deliveries = DeliveryStore()  # Columnar log of every delivery, both innings
+        self._undo_stack = []  # State values from before each delivery
+        self._snapshot = None
+        self._journal = None  # Optional MatchJournal for crash recovery
+        self._journal_count = 0  # Records since the last journal snapshot
+        self._listeners = ()  # Callbacks fired on every publish, e.g. the scoreboard feed
+        self._ball_by_ball = (0, 0, ())  # Last published (innings_start, delivery count, symbols)
+        with self._lock:
+            self._publish()
+
+    def _publish(self):
+        """Freeze the current state into a new snapshot (call with the lock held)"""
+        state = self._state
+        self._snapshot = ScoreSnapshot(
+            state["runs"], state["wickets"], state["balls"], state["extras"], state["wides"],
+            state["noballs"], state["byes"], state["legbyes"], state["last_action"],
+            self._innings_symbols(), state["last_gesture_time"],
+            state["cooldown_period"], state["free_hit"], state["innings"], state["first_innings_score"],
+            state["first_innings_wickets"], state["first_innings_balls"], state["match_overs"],
+            state["match_complete"], state["winner"], derive_stats(state))
+        self._version += 1
+        self._changed.notify_all()
+        for listener in self._listeners:
+            listener(self._version, self._snapshot)
+
+    def _innings_symbols(self):
+        """Ball-by-ball text of this innings, extended or trimmed from the last publish instead of rebuilt"""
+        start, count = self._state["innings_start"], len(self._deliveries)
+        last_start, last_count, symbols = self._ball_by_ball
+        if start != last_start or not count - 1 <= last_count <= count + 1 or count <= start:
+            symbols = self._deliveries.symbols(start)
+        elif count == last_count + 1:
+            symbols += (self._deliveries.symbol(count - 1),)
+        elif count == last_count - 1:
+            symbols = symbols[:-1]
+        self._ball_by_ball = (start, count, symbols)
+        return symbols
+
+    def snapshot(self):
+        """Latest published snapshot; a plain attribute read, no locking needed"""
+        return self._snapshot
+
+    def version(self):
+        """Counter bumped every time a new snapshot is published"""
+        return self._version
+
+    def wait_for_change(self, version, timeout=None):
+        """Block until the published version differs from `version` (or timeout); return the current version"""
+        with self._changed:
+            self._changed.wait_for(lambda: self._version != version, timeout)
+            return self._version
+
+    def add_listener(self, callback):
+        """Call callback(version, snapshot) after every publish.
+
+        Runs on the mutating thread with the engine lock held, so callbacks
+        must only hand the snapshot off (e.g. loop.call_soon_threadsafe).
+        """
+        with self._lock:
+            self._listeners = self._listeners + (callback,)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            self._listeners = tuple(l for l in self._listeners if l is not callback)
+
+    def get_stats(self):
+        """Derived statistics (MatchStats) of the latest snapshot"""
+        return self._snapshot.stats
+
+    def get_score(self):
+        """Get current match score"""
+        snap = self._snapshot
+        overs = snap.balls // 6
+        balls_in_over = snap.balls % 6
+        
+        # Calculate remaining cooldown time
+        current_time = time.time()
+        time_since_last = current_time - snap.last_gesture_time
+        cooldown_remaining = max(0, snap.cooldown_period - time_since_last)
+        
+        return (snap.runs, snap.wickets, overs, balls_in_over, snap.last_action, 
+                snap.ball_by_ball, cooldown_remaining, snap.extras, snap.wides, 
+                snap.noballs, snap.byes, snap.legbyes, snap.free_hit, 
+                snap.innings, snap.first_innings_score, snap.match_complete, snap.winner)
+
+    def update_score(self, gesture):
+        """Update score based on gesture with cooldown"""
+        with self._lock:
+            delivery_count = len(self._deliveries)
+            self._update_score(gesture)
+            if len(self._deliveries) > delivery_count:
+                delivery = self._deliveries[-1]
+                self._record({"op": "ball", "g": delivery.gesture, "t": delivery.timestamp})
+            self._publish()
+
+    def _update_score(self, gesture):
+        state = self._state
+        current_time = time.time()
+        
+        # Check if we're still in cooldown period
+        if current_time - state["last_gesture_time"] < state["cooldown_period"]:
+            event(DEBUG, "gesture_ignored", reason="cooldown", gesture=gesture)
+            return  # Ignore gesture during cooldown
+        
+        # Check for duplicate gesture
+        if state["last_updated_figures"] == gesture:
+            event(DEBUG, "gesture_ignored", reason="duplicate", gesture=gesture)
+            return  # prevent duplicate score
+        
+        if gesture not in OUTCOMES:
+            event(WARNING, "gesture_ignored", reason="unknown", gesture=repr(gesture))
+            return
+        
+        # Update the last gesture time and gesture
+        state["last_gesture_time"] = current_time
+        state["last_updated_figures"] = gesture
+        self._apply(gesture, current_time)
+        delivery = self._deliveries[-1]
+        event(INFO, "delivery", innings=delivery.innings, ball=delivery.symbol, runs=state["runs"],
+              wickets=state["wickets"], balls=state["balls"], action=repr(state["last_action"]))
+        if debug_enabled():
+            self._log_state("delivery")
+
+    def _apply(self, gesture, timestamp):
+        """Score one delivery from its OUTCOMES row and append it to the ball log"""
+        state = self._state
+        previous = tuple(state.values())  # Fixed-size copy, every value is immutable
+        outcome = OUTCOMES[gesture]
+        free_hit = state["free_hit"]
+        wicket = outcome.wicket and (outcome.out_on_free_hit or not free_hit)
+        
+        state["runs"] += outcome.runs
+        state["extras"] += outcome.extras
+        if outcome.bucket is not None:
+            state[outcome.bucket] += outcome.extras
+        if outcome.legal:
+            state["balls"] += 1
+        if wicket:
+            state["wickets"] += 1
+        if outcome.free_hit == SET_FREE_HIT:
+            state["free_hit"] = True
+        elif outcome.free_hit == USE_FREE_HIT:
+            state["free_hit"] = False
+        state["last_action"] = outcome.free_hit_action if free_hit else outcome.action
+        
+        delivery = Delivery(
+            gesture, outcome.symbol if wicket or not outcome.wicket else outcome.not_out_symbol,
+            outcome.runs, outcome.legal, wicket, state["innings"], timestamp, free_hit)
+        self._deliveries.append(delivery)
+        self._undo_stack.append(previous)
+        self._count(delivery, outcome)
+        
+        # Handle over completion (only for legal deliveries)
+        if outcome.legal and state["balls"] % 6 == 0:
+            state["last_action"] += " - Over Complete!"
     
-    return (state["runs"], state["wickets"], overs, balls_in_over, state["last_action"], 
-            state["ball_by_ball"], cooldown_remaining, state["extras"], state["wides"], 
-            state["noballs"], state["byes"], state["legbyes"], state["free_hit"], 
-            state["innings"], state["first_innings_score"], state["match_complete"], state["winner"])
+        # Check for innings completion
+        self._check_innings_completion()
+
+    def _count(self, delivery, outcome):
+        """Update the MatchStats counters for one delivery; undo restores them with the rest of the state"""
+        state = self._state
+        state["this_over"] += delivery.runs
+        state["partnership_runs"] += delivery.runs
+        if outcome.bat_runs == 4:
+            state["fours"] += 1
+        elif outcome.bat_runs == 6:
+            state["sixes"] += 1
+        if delivery.legal:
+            state["partnership_balls"] += 1
+            if delivery.runs == 0:
+                state["dot_balls"] += 1
+            if state["balls"] % 6 == 0:
+                state["over_runs"] += (state["this_over"],)  # New tuple, so undo keeps the old one
+                state["this_over"] = 0
+        if delivery.wicket:
+            state["partnership_runs"] = 0
+            state["partnership_balls"] = 0
+
+    def reset_gesture_flag(self):
+        """Reset gesture flag when no hand is detected"""
+        with self._lock:
+            self._state["last_updated_figures"] = None
+
+    def set_match_overs(self, overs):
+        """Set match overs from session state"""
+        with self._lock:
+            self._state["match_overs"] = overs
+            self._record({"op": "overs", "overs": overs})
+            self._publish()
+
+    def reset_match(self, match_overs=None):
+        """Reset the entire match"""
+        with self._lock:
+            if match_overs is None:
+                match_overs = self._state["match_overs"]
+            state = new_match_state(match_overs, self._state["cooldown_period"])
+            state["last_action"] = "Match Reset"
+            self._state = state
+            self._deliveries = DeliveryStore()
+            self._undo_stack = []
+            event(INFO, "reset", match_overs=match_overs)
+            if self._journal is not None:
+                # A reset makes the whole journal obsolete; start again from a snapshot
+                self._journal.write_snapshot(self.export_state())
+                self._journal_count = 0
+            self._publish()
+
+    def undo_last_ball(self):
+        """Undo the last ball"""
+        with self._lock:
+            if self._deliveries:
+                self._undo_last_ball()
+                self._record({"op": "undo"})
+                if debug_enabled():
+                    self._log_state("undo")
+            else:
+                event(INFO, "undo_ignored", reason="no_balls")
+            self._publish()
 
-def update_score(gesture):
-    """Update score based on gesture with cooldown"""
-    current_time = time.time()
-    
-    # Check if we're still in cooldown period
-    if current_time - state["last_gesture_time"] < state["cooldown_period"]:
-        print(f"Gesture ignored - cooldown active")
-        return  # Ignore gesture during cooldown
-    
-    # Check for duplicate gesture
-    if state["last_updated_figures"] == gesture:
-        print(f"Duplicate gesture ignored: {gesture}")
-        return  # prevent duplicate score
-    
-    # Update the last gesture time and gesture
-    state["last_gesture_time"] = current_time
-    state["last_updated_figures"] = gesture
-    
-    print(f"Processing gesture: {gesture}")
-    
-    # Handle special gestures first
-    if gesture == "no_ball":
-        state["runs"] += 1  # No ball gives 1 run penalty
-        state["extras"] += 1
-        state["noballs"] += 1
-        state["free_hit"] = True  # Next ball is a free hit
-        state["last_action"] = "NO BALL! (+1 run, Free Hit next)"
-        state["ball_by_ball"].append("NB")
-        print(f"No Ball - Runs: {state['runs']}, Extras: {state['extras']}")
-        # No ball doesn't count as a legal delivery, so don't increment balls
+    def _undo_last_ball(self):
+        """Pop the last delivery and restore the exact state from before it"""
+        if not self._deliveries:
+            return
         
-    elif gesture == "wide":
-        state["runs"] += 1  # Wide gives 1 run penalty
-        state["extras"] += 1
-        state["wides"] += 1
-        state["last_action"] = "WIDE! (+1 run)"
-        state["ball_by_ball"].append("WD")
-        print(f"Wide - Runs: {state['runs']}, Extras: {state['extras']}")
-        # Wide doesn't count as a legal delivery, so don't increment balls
+        if not self._undo_stack:
+            # Deliveries restored from a journal snapshot carry no undo records;
+            # rebuild them once by replaying the log
+            rebuilt = ScoreEngine.replay(self._deliveries, self._state["match_overs"],
+                                         self._state["cooldown_period"])
+            self._undo_stack = rebuilt._undo_stack
         
-    elif gesture == "bye":
-        # Byes don't add to batsman's score but add to team total
-        state["runs"] += 1
-        state["extras"] += 1
-        state["byes"] += 1
-        state["balls"] += 1  # Legal delivery
-        state["last_action"] = "BYE! (+1 run)"
-        state["ball_by_ball"].append("B1")
-        print(f"Bye - Runs: {state['runs']}, Balls: {state['balls']}")
+        delivery = self._deliveries.pop()
+        previous = dict(zip(STATE_KEYS, self._undo_stack.pop()))
         
-    elif gesture == "leg_bye":
-        # Leg byes don't add to batsman's score but add to team total
-        state["runs"] += 1
-        state["extras"] += 1
-        state["legbyes"] += 1
-        state["balls"] += 1  # Legal delivery
-        state["last_action"] = "LEG BYE! (+1 run)"
-        state["ball_by_ball"].append("LB1")
-        print(f"Leg Bye - Runs: {state['runs']}, Balls: {state['balls']}")
+        # The saved state includes innings_start, so this also steps back across an innings switch
+        previous["last_gesture_time"] = self._state["last_gesture_time"]
+        previous["last_updated_figures"] = None
+        self._state = previous
+        event(INFO, "undo", ball=delivery.symbol, runs=previous["runs"], wickets=previous["wickets"],
+              balls=previous["balls"])
+
+    def _log_state(self, after):
+        """DEBUG dump of the whole state and this innings' ball log (lock held; opt-in, grows with the match)"""
+        state = self._state
+        event(DEBUG, "state", after=after, **{key: state[key] for key in STATE_KEYS if key != "cooldown_period"},
+              ball_by_ball=" ".join(self._deliveries.symbols(state["innings_start"])))
+
+    def deliveries(self):
+        """Copy of the ball log for the current match"""
+        with self._lock:
+            return list(self._deliveries)
+
+    def delivery_columns(self):
+        """The whole ball log, both innings, as NumPy columns (see DeliveryStore.columns)"""
+        with self._lock:
+            return self._deliveries.columns()
+
+    def state_at(self, ball_count):
+        """Snapshot of the match after its first ball_count deliveries, rebuilt by replay"""
+        with self._lock:
+            deliveries = self._deliveries[:ball_count]
+            match_overs = self._state["match_overs"]
+            cooldown_period = self._state["cooldown_period"]
+        return ScoreEngine.replay(deliveries, match_overs, cooldown_period).snapshot()
+
+    @classmethod
+    def replay(cls, deliveries, match_overs=20, cooldown_period=3.0):
+        """Build an engine by re-applying logged deliveries in order"""
+        engine = cls(match_overs, cooldown_period)
+        with engine._lock:
+            for delivery in deliveries:
+                engine._replay_ball(delivery.gesture, delivery.timestamp)
+            engine._publish()
+        return engine
+
+    def _replay_ball(self, gesture, timestamp):
+        """Re-apply a logged delivery, bypassing the cooldown and duplicate checks"""
+        self._state["last_gesture_time"] = timestamp
+        self._state["last_updated_figures"] = gesture
+        self._apply(gesture, timestamp)
+
+    def export_state(self):
+        """Full state plus ball log, restorable without replay (call with the lock held)"""
+        state = dict(self._state)
+        return {"state": state, "deliveries": [list(d) for d in self._deliveries]}
+
+    def _restore(self, exported):
+        """Load export_state() output; undo records are rebuilt lazily on first undo"""
+        state = exported["state"]
+        defaults = new_match_state()
+        self._state = {key: state.get(key, defaults[key]) for key in STATE_KEYS}
+        self._state["over_runs"] = tuple(self._state["over_runs"])
+        self._deliveries = DeliveryStore(Delivery(*d) for d in exported["deliveries"])
+        self._undo_stack = []
+        missing = [key for key in STATE_KEYS if key not in state]
+        if missing:
+            # Snapshot from before these counters existed; recount them by replay
+            rebuilt = ScoreEngine.replay(self._deliveries, self._state["match_overs"],
+                                         self._state["cooldown_period"])
+            for key in missing:
+                self._state[key] = rebuilt._state[key]
+
+    def _record(self, record):
+        """Journal one change and periodically replace the journal with a snapshot (lock held)"""
+        if self._journal is None:
+            return
+        self._journal.append(record)
+        self._journal_count += 1
+        if self._journal_count >= SNAPSHOT_EVERY:
+            self._journal.write_snapshot(self.export_state())
+            self._journal_count = 0
+
+    @classmethod
+    def recover(cls, journal, match_overs=20, cooldown_period=3.0):
+        """Rebuild an engine from its journal (snapshot + tail) and keep journaling to it"""
+        snapshot, records = journal.load()
+        engine = cls(match_overs, cooldown_period)
+        with engine._lock:
+            if snapshot is not None:
+                engine._restore(snapshot)
+            for record in records:
+                if record["op"] == "ball":
+                    engine._replay_ball(record["g"], record["t"])
+                elif record["op"] == "undo" and engine._deliveries:
+                    engine._undo_last_ball()
+                elif record["op"] == "overs":
+                    engine._state["match_overs"] = record["overs"]
+            engine._journal = journal
+            if records:
+                # Fold the replayed tail into a fresh snapshot
+                journal.write_snapshot(engine.export_state())
+            if snapshot is not None or records:
+                event(INFO, "recovered", journal=journal.path, deliveries=len(engine._deliveries))
+            engine._publish()
+        return engine
+
+    def close(self):
+        """Flush and close the journal, if any"""
+        with self._lock:
+            journal, self._journal = self._journal, None
+        if journal is not None:
+            journal.close()
+
+    def to_record(self):
+        """Compact, JSON-friendly persistence format: settings plus (gesture, timestamp) pairs"""
+        with self._lock:
+            return {
+                "match_overs": self._state["match_overs"],
+                "cooldown_period": self._state["cooldown_period"],
+                "deliveries": [[d.gesture, d.timestamp] for d in self._deliveries],
+            }
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild an engine from to_record() output"""
+        deliveries = [Delivery(gesture, None, 0, False, False, 0, timestamp)
+                      for gesture, timestamp in record["deliveries"]]
+        return cls.replay(deliveries, record["match_overs"], record["cooldown_period"])
+
+    def _check_innings_completion(self):
+        """Check if innings is complete and handle innings switch"""
+        state = self._state
+        max_balls = state["match_overs"] * 6
+    
+        # First innings completion conditions
+        if state["innings"] == 1 and (state["balls"] >= max_balls or state["wickets"] >= 10):
+            # Store first innings data
+            state["first_innings_score"] = state["runs"]
+            state["first_innings_wickets"] = state["wickets"]
+            state["first_innings_balls"] = state["balls"]
         
-    elif gesture == "dot_ball":
-        # Dot ball - no runs, but legal delivery
-        state["balls"] += 1
-        if state["free_hit"]:
-            state["last_action"] = "Dot Ball (Free Hit)"
+            # Start second innings
+            state["innings"] = 2
+            state["runs"] = 0
+            state["wickets"] = 0
+            state["balls"] = 0
+            state["extras"] = 0
+            state["wides"] = 0
+            state["noballs"] = 0
+            state["byes"] = 0
+            state["legbyes"] = 0
+            state["innings_start"] = len(self._deliveries)
             state["free_hit"] = False
-        else:
-            state["last_action"] = "Dot Ball"
-        state["ball_by_ball"].append("•")
-        print(f"Dot Ball - Balls: {state['balls']}")
+            state["over_runs"] = ()
+            state["this_over"] = 0
+            state["partnership_runs"] = 0
+            state["partnership_balls"] = 0
+            state["fours"] = 0
+            state["sixes"] = 0
+            state["dot_balls"] = 0
         
-    # Handle regular finger gestures
-    elif isinstance(gesture, int):
-        if gesture == 0:  # Fist - Wicket
-            if not state["free_hit"]:  # Can't get out on free hit (except run out)
-                state["wickets"] += 1
-                state["last_action"] = "WICKET!"
-                state["ball_by_ball"].append("W")
-            else:
-                state["last_action"] = "Free Hit - No Wicket (Dot Ball)"
-                state["ball_by_ball"].append("•")
-            state["balls"] += 1  # Legal delivery
-            state["free_hit"] = False  # Free hit is over
-            print(f"Wicket/Dot - Wickets: {state['wickets']}, Balls: {state['balls']}")
-            
-        elif gesture == 1:  # 1 finger - 1 run
-            state["runs"] += 1
-            state["balls"] += 1  # Legal delivery
-            if state["free_hit"]:
-                state["last_action"] = "1 Run (Free Hit)"
-                state["free_hit"] = False
-            else:
-                state["last_action"] = "1 Run"
-            state["ball_by_ball"].append("1")
-            print(f"1 Run - Runs: {state['runs']}, Balls: {state['balls']}")
-            
-        elif gesture == 2:  # 2 fingers - 2 runs
-            state["runs"] += 2
-            state["balls"] += 1  # Legal delivery
-            if state["free_hit"]:
-                state["last_action"] = "2 Runs (Free Hit)"
-                state["free_hit"] = False
-            else:
-                state["last_action"] = "2 Runs"
-            state["ball_by_ball"].append("2")
-            print(f"2 Runs - Runs: {state['runs']}, Balls: {state['balls']}")
-            
-        elif gesture == 3:  # 3 fingers - 3 runs
-            state["runs"] += 3
-            state["balls"] += 1  # Legal delivery
-            if state["free_hit"]:
-                state["last_action"] = "3 Runs (Free Hit)"
-                state["free_hit"] = False
-            else:
-                state["last_action"] = "3 Runs"
-            state["ball_by_ball"].append("3")
-            print(f"3 Runs - Runs: {state['runs']}, Balls: {state['balls']}")
-            
-        elif gesture == 4:  # 4 fingers - 4 runs
-            state["runs"] += 4
-            state["balls"] += 1  # Legal delivery
-            if state["free_hit"]:
-                state["last_action"] = "4 Runs - Boundary (Free Hit)"
-                state["free_hit"] = False
-            else:
-                state["last_action"] = "4 Runs (Boundary)"
-            state["ball_by_ball"].append("4")
-            print(f"4 Runs - Runs: {state['runs']}, Balls: {state['balls']}")
+            target = state["first_innings_score"] + 1
+            state["last_action"] = f"First Innings Complete! Target: {target} runs"
+        
+        # Second innings completion conditions
+        elif state["innings"] == 2:
+            target = state["first_innings_score"] + 1
+        
+            # Check if target achieved
+            if state["runs"] >= target:
+                state["match_complete"] = True
+                state["winner"] = "chasing_team"
+                balls_remaining = max_balls - state["balls"]
+                state["last_action"] = f"Match Won! Target achieved with {balls_remaining} balls remaining!"
             
-        elif gesture == 5:  # 5 fingers - 6 runs (six)
-            state["runs"] += 6
-            state["balls"] += 1  # Legal delivery
-            if state["free_hit"]:
-                state["last_action"] = "6 Runs - Six! (Free Hit)"
-                state["free_hit"] = False
-            else:
-                state["last_action"] = "6 Runs (Six!)"
-            state["ball_by_ball"].append("6")
-            print(f"6 Runs - Runs: {state['runs']}, Balls: {state['balls']}")
-    
-    # Handle over completion (only for legal deliveries)
-    if state["balls"] > 0 and (state["balls"] % 6) == 0:
-        state["last_action"] += " - Over Complete!"
-        print(f"Over completed! Total balls: {state['balls']}")
-    
-    # Check for innings completion
-    check_innings_completion()
-    
-    print(f"Final state - Runs: {state['runs']}, Wickets: {state['wickets']}, Balls: {state['balls']}")
-    print(f"Ball by ball: {state['ball_by_ball']}")
+            # Check if innings complete without achieving target
+            elif state["balls"] >= max_balls or state["wickets"] >= 10:
+                state["match_complete"] = True
+                if state["runs"] == state["first_innings_score"]:
+                    state["winner"] = "tie"
+                    state["last_action"] = "Match Tied!"
+                else:
+                    state["winner"] = "defending_team"
+                    runs_short = target - state["runs"]
+                    state["last_action"] = f"Match Lost! Fell short by {runs_short} runs!"
+
+    def get_match_status(self):
+        """Get current match status for display"""
+        snap = self._snapshot
+        if snap.innings == 1:
+            return f"First Innings - {snap.match_overs} Overs"
+        elif snap.innings == 2 and not snap.match_complete:
+            return f"Second Innings - Need {snap.stats.need} runs in {snap.stats.balls_left} balls"
+        else:
+            return "Match Complete"
+
+class MatchRegistry:
+    """Holds one ScoreEngine per match ID so a single process can score many grounds"""
+
+    def __init__(self, journal_dir=None):
+        self._matches = {}
+        self._lock = threading.Lock()
+        self.journal_dir = journal_dir  # Directory for per-match journals; None disables them
+
+    def get(self, match_id, match_overs=20):
+        """Engine for match_id, created on first use"""
+        engine = self._matches.get(match_id)
+        if engine is None:
+            with self._lock:
+                engine = self._matches.get(match_id)
+                if engine is None:
+                    if self.journal_dir:
+                        try:
+                            engine = ScoreEngine.recover(MatchJournal(self.journal_dir, match_id), match_overs)
+                        except JournalLocked as e:
+                            # Another process is scoring this match; never write to its journal
+                            event(WARNING, "journal_locked", match=match_id, error=repr(str(e)))
+                    if engine is None:
+                        engine = ScoreEngine(match_overs)
+                    self._matches[match_id] = engine
+        return engine
+
+    def remove(self, match_id):
+        """Drop a finished match"""
+        with self._lock:
+            engine = self._matches.pop(match_id, None)
+        if engine is not None:
+            engine.close()
+
+    def match_ids(self):
+        return list(self._matches)
+
+    def __contains__(self, match_id):
+        return match_id in self._matches
+
+    def __len__(self):
+        return len(self._matches)
+
+DEFAULT_MATCH_ID = "default"
+
+# Journals survive a process restart. Opt-in: only the process that scores (main_app,
+# multi_camera) sets SCORE_JOURNAL_DIR; every other importer keeps matches in memory
+registry = MatchRegistry(os.environ.get("SCORE_JOURNAL_DIR") or None)
+
+# Default engine behind the module-level API
+engine = registry.get(DEFAULT_MATCH_ID)
+
+def get_engine(match_id=DEFAULT_MATCH_ID):
+    """ScoreEngine for a match; accepts an engine and returns it unchanged"""
+    if isinstance(match_id, ScoreEngine):
+        return match_id
+    return registry.get(match_id)
+
+def get_score(match_id=DEFAULT_MATCH_ID):
+    """Get current match score"""
+    return get_engine(match_id).get_score()
+
+def get_stats(match_id=DEFAULT_MATCH_ID):
+    """Derived statistics (run rates, projection, partnership, ...) for a match"""
+    return get_engine(match_id).get_stats()
+
+def wait_for_score_change(version, timeout=None, match_id=DEFAULT_MATCH_ID):
+    """Block until the score changes from `version` (or timeout); returns the new version"""
+    return get_engine(match_id).wait_for_change(version, timeout)
 
-def reset_gesture_flag():
+def update_score(gesture, match_id=DEFAULT_MATCH_ID):
+    """Update score based on gesture with cooldown"""
+    get_engine(match_id).update_score(gesture)
+
+def reset_gesture_flag(match_id=DEFAULT_MATCH_ID):
     """Reset gesture flag when no hand is detected"""
-    state["last_updated_figures"] = None
+    get_engine(match_id).reset_gesture_flag()
 
-def set_match_overs(overs):
+def set_match_overs(overs, match_id=DEFAULT_MATCH_ID):
     """Set match overs from session state"""
-    state["match_overs"] = overs
+    get_engine(match_id).set_match_overs(overs)
 
-def reset_match():
+def reset_match(match_id=DEFAULT_MATCH_ID):
     """Reset the entire match"""
-    print("Resetting match...")
-    state["runs"] = 0
-    state["wickets"] = 0
-    state["balls"] = 0
-    state["extras"] = 0
-    state["wides"] = 0
-    state["noballs"] = 0
-    state["byes"] = 0
-    state["legbyes"] = 0
-    state["last_updated_figures"] = None
-    state["last_action"] = "Match Reset"
-    state["ball_by_ball"] = []
-    state["last_gesture_time"] = 0  # Reset cooldown timer
-    state["free_hit"] = False
-    state["innings"] = 1
-    state["first_innings_score"] = 0
-    state["first_innings_wickets"] = 0
-    state["first_innings_balls"] = 0
-    state["match_complete"] = False
-    state["winner"] = None
-    
     # Get match overs from session state if available
+    match_overs = None
     try:
-        import streamlit as st
         if 'match_overs' in st.session_state:
-            state["match_overs"] = st.session_state.match_overs
+            match_overs = st.session_state.match_overs
     except:
-        state["match_overs"] = 20  # Default to 20 overs
+        match_overs = 20  # Default to 20 overs
+    get_engine(match_id).reset_match(match_overs)
 
-def undo_last_ball():
+def undo_last_ball(match_id=DEFAULT_MATCH_ID):
     """Undo the last ball"""
-    if not state["ball_by_ball"]:
-        print("No balls to undo")
-        return
-        
-    last_ball = state["ball_by_ball"].pop()
-    print(f"Undoing ball: {last_ball}")
-    
-    # Handle different types of deliveries
-    if last_ball == "W":
-        state["wickets"] = max(0, state["wickets"] - 1)
-        state["balls"] = max(0, state["balls"] - 1)
-    elif last_ball == "NB":
-        state["runs"] = max(0, state["runs"] - 1)
-        state["extras"] = max(0, state["extras"] - 1)
-        state["noballs"] = max(0, state["noballs"] - 1)
-        state["free_hit"] = False
-    elif last_ball == "WD":
-        state["runs"] = max(0, state["runs"] - 1)
-        state["extras"] = max(0, state["extras"] - 1)
-        state["wides"] = max(0, state["wides"] - 1)
-    elif last_ball == "B1":
-        state["runs"] = max(0, state["runs"] - 1)
-        state["extras"] = max(0, state["extras"] - 1)
-        state["byes"] = max(0, state["byes"] - 1)
-        state["balls"] = max(0, state["balls"] - 1)
-    elif last_ball == "LB1":
-        state["runs"] = max(0, state["runs"] - 1)
-        state["extras"] = max(0, state["extras"] - 1)
-        state["legbyes"] = max(0, state["legbyes"] - 1)
-        state["balls"] = max(0, state["balls"] - 1)
-    elif last_ball == "•":  # Dot ball
-        state["balls"] = max(0, state["balls"] - 1)
-    elif last_ball.isdigit():
-        runs_to_subtract = int(last_ball)
-        if last_ball == "6":  # Six is worth 6 runs but shows as "6"
-            runs_to_subtract = 6
-        state["runs"] = max(0, state["runs"] - runs_to_subtract)
-        state["balls"] = max(0, state["balls"] - 1)
-    
-    state["last_action"] = f"Undid: {last_ball}"
-    state["last_updated_figures"] = None
-    print(f"After undo - Runs: {state['runs']}, Wickets: {state['wickets']}, Balls: {state['balls']}")
+    get_engine(match_id).undo_last_ball()
 
-def check_innings_completion():
-    """Check if innings is complete and handle innings switch"""
-    max_balls = state["match_overs"] * 6
-    
-    # First innings completion conditions
-    if state["innings"] == 1 and (state["balls"] >= max_balls or state["wickets"] >= 10):
-        # Store first innings data
-        state["first_innings_score"] = state["runs"]
-        state["first_innings_wickets"] = state["wickets"]
-        state["first_innings_balls"] = state["balls"]
-        
-        # Start second innings
-        state["innings"] = 2
-        state["runs"] = 0
-        state["wickets"] = 0
-        state["balls"] = 0
-        state["extras"] = 0
-        state["wides"] = 0
-        state["noballs"] = 0
-        state["byes"] = 0
-        state["legbyes"] = 0
-        state["ball_by_ball"] = []
-        state["free_hit"] = False
-        
-        target = state["first_innings_score"] + 1
-        state["last_action"] = f"First Innings Complete! Target: {target} runs"
-        
-    # Second innings completion conditions
-    elif state["innings"] == 2:
-        target = state["first_innings_score"] + 1
-        
-        # Check if target achieved
-        if state["runs"] >= target:
-            state["match_complete"] = True
-            state["winner"] = "chasing_team"
-            balls_remaining = max_balls - state["balls"]
-            state["last_action"] = f"Match Won! Target achieved with {balls_remaining} balls remaining!"
-            
-        # Check if innings complete without achieving target
-        elif state["balls"] >= max_balls or state["wickets"] >= 10:
-            state["match_complete"] = True
-            if state["runs"] == state["first_innings_score"]:
-                state["winner"] = "tie"
-                state["last_action"] = "Match Tied!"
-            else:
-                state["winner"] = "defending_team"
-                runs_short = target - state["runs"]
-                state["last_action"] = f"Match Lost! Fell short by {runs_short} runs!"
-
-def get_match_status():
+def get_match_status(match_id=DEFAULT_MATCH_ID):
     """Get current match status for display"""
-    if state["innings"] == 1:
-        return f"First Innings - {state['match_overs']} Overs"
-    elif state["innings"] == 2 and not state["match_complete"]:
-        target = state["first_innings_score"] + 1
-        need = target - state["runs"]
-        balls_left = (state["match_overs"] * 6) - state["balls"]
-        return f"Second Innings - Need {need} runs in {balls_left} balls"
-    else:
-        return "Match Complete"
\ No newline at end of file
+    return get_engine(match_id).get_match_status()
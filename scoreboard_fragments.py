@@ -0,0 +1,240 @@
+# scoreboard_fragments.py
+"""The live scoreboard of main_app.py as separately rendered fragments.
+
+Each render_* function takes only the fields its fragment shows, all
+hashable, and is memoized, so a fragment is built once per distinct input
+and every viewer of a match shares that rendering. FragmentSlots gives
+each fragment its own Streamlit placeholder and, for as long as those
+placeholders live, only sends a fragment when it differs from what they
+show. main_app.py's scoreboard is an st.fragment that reruns every second
+with fresh placeholders and keeps them while it waits out the rest of that
+second for score changes, so there most of the saving is the memoized
+render; only changes within a run skip unchanged fragments.
+"""
+from functools import lru_cache
+
+CACHE_SIZE = 256  # Distinct renderings kept per fragment, enough for a few matches per process
+
+# Placeholders of the scoreboard, top to bottom
+SCOREBOARD_FRAGMENTS = ("score", "first_innings", "extras", "cooldown", "ball_by_ball", "stats")
+
+LEGEND = """
+**Ball Symbols:**
+• = Dot, W = Wicket, 1-6 = Runs, NB = No Ball, WD = Wide, B1 = Bye, LB1 = Leg Bye
+"""
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def render_result(winner, winner_team, runs, wickets, overs, balls, first_innings_score, last_action):
+    """Match complete banner"""
+    if winner == "tie":
+        background, border, color, heading, title = "#fff3cd", "#ffc107", "#856404", "🤝 MATCH TIED!", "It's a Tie!"
+        title_color = color
+    else:
+        background, border, color, heading, title = "#d4edda", "#28a745", "#155724", "🏆 MATCH COMPLETE!", f"{winner_team} WINS!"
+        title_color = border
+    return f"""
+    <div style="background-color: {background}; padding: 30px; border-radius: 15px; text-align: center; margin: 20px 0; border: 3px solid {border};">
+        <h2 style="color: {color}; margin: 0;">{heading}</h2>
+        <h1 style="color: {title_color}; margin: 10px 0; font-size: 2.5em;">{title}</h1>
+        <h3 style="color: {color}; margin: 10px 0;">Final Score: {runs}/{wickets} ({overs}.{balls} overs)</h3>
+        <h4 style="color: {color}; margin: 10px 0;">First Innings: {first_innings_score}</h4>
+        <p style="color: {color}; margin: 10px 0; font-size: 1.1em;"><strong>{last_action}</strong></p>
+    </div>
+    """
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def render_score_card(team, innings, runs, wickets, overs, balls, match_overs, last_action, free_hit,
+                      target=None, need=None, balls_left=None, required_rate=None):
+    """Main score display; target, need, balls left and required rate are shown in the second innings"""
+    target_info = ""
+    if innings == 2:
+        required = f" (RRR {required_rate})" if required_rate is not None else ""
+        target_info = f"<p style='color: #dc3545; margin: 5px 0; font-weight: bold;'>Target: {target} | Need: {need} runs in {balls_left} balls{required}</p>"
+    free_hit_info = '<p style="color: #ff6b6b; margin: 5px 0; font-weight: bold;">🔥 FREE HIT NEXT BALL!</p>' if free_hit else ''
+    return f"""
+    <div style="background-color: #f0f2f6; padding: 30px; border-radius: 15px; text-align: center; margin: 20px 0;">
+        <h3 style="color: #1f77b4; margin: 0;">{team} - Innings {innings}</h3>
+        <h1 style="color: #1f77b4; margin: 0; font-size: 3em;">{runs}/{wickets}</h1>
+        <h2 style="color: #666; margin: 15px 0;">Overs: {overs}.{balls}/{match_overs}</h2>
+        {target_info}
+        <p style="color: #888; margin: 10px 0; font-size: 1.1em;"><strong>Last Action:</strong> {last_action}</p>
+        {free_hit_info}
+    </div>
+    """
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def render_first_innings(team, score):
+    """First innings reminder shown during the chase"""
+    return f"""
+    <div style="background-color: #e9ecef; padding: 15px; border-radius: 10px; text-align: center; margin: 10px 0;">
+        <h4 style="color: #495057; margin: 0;">First Innings: {team} - {score}</h4>
+    </div>
+    """
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def render_extras(extras, wides, noballs, byes, legbyes):
+    """Extras breakdown, empty until the first extra"""
+    if extras <= 0:
+        return ""
+    return f"""
+    <div style="background-color: #fff3cd; padding: 15px; border-radius: 10px; margin: 10px 0;">
+        <h4 style="color: #856404; margin: 0;">📊 Extras Breakdown (Total: {extras})</h4>
+        <div style="display: flex; justify-content: space-around; margin-top: 10px;">
+            <span style="color: #856404;"><strong>Wides:</strong> {wides}</span>
+            <span style="color: #856404;"><strong>No Balls:</strong> {noballs}</span>
+            <span style="color: #856404;"><strong>Byes:</strong> {byes}</span>
+            <span style="color: #856404;"><strong>Leg Byes:</strong> {legbyes}</span>
+        </div>
+    </div>
+    """
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def render_cooldown(seconds, free_hit):
+    """Cooldown banner while gestures are ignored (`seconds` rounded to a tenth), else the ready banner"""
+    if seconds > 0:
+        return f"""
+        <div style="background-color: #fff3cd; padding: 15px; border-radius: 10px; text-align: center; margin: 10px 0; border-left: 5px solid #ffc107;">
+            <h4 style="color: #856404; margin: 0;">⏳ Gesture Cooldown Active</h4>
+            <p style="color: #856404; margin: 5px 0;">Next gesture accepted in: <strong>{seconds:.1f} seconds</strong></p>
+            <p style="color: #856404; margin: 5px 0; font-size: 0.9em;">Gestures are ignored during this period to prevent accidental scoring</p>
+        </div>
+        """
+    free_hit_info = '<p style="color: #ff6b6b; margin: 5px 0; font-weight: bold;">🔥 Next ball is a FREE HIT!</p>' if free_hit else ''
+    return f"""
+    <div style="background-color: #d1edff; padding: 15px; border-radius: 10px; text-align: center; margin: 10px 0; border-left: 5px solid #0066cc;">
+        <h4 style="color: #004085; margin: 0;">✅ Ready for Next Gesture</h4>
+        <p style="color: #004085; margin: 5px 0;">Show your hand gesture to the camera to score</p>
+        {free_hit_info}
+    </div>
+    """
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def render_ball_by_ball(recent, deliveries, legal_balls):
+    """(strip, caption) for the last deliveries of the innings; `recent` is a tuple of at most 18 symbols"""
+    return " | ".join(recent), f"Total deliveries: {deliveries} | Legal balls: {legal_balls}"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def render_stats(run_rate, projected_score, partnership_runs, partnership_balls, fours, sixes, dot_balls,
+                 dot_percent, over_runs):
+    """(summary, caption) markdown of the match statistics; over_runs includes the over in progress"""
+    return (f"**Current Run Rate:** {run_rate} runs per over | **Projected:** {projected_score}",
+            f"Partnership: {partnership_runs} ({partnership_balls} balls) | "
+            f"4s: {fours} | 6s: {sixes} | Dot balls: {dot_balls} ({dot_percent}%) | "
+            f"Runs per over: {' '.join(map(str, over_runs))}")
+
+
+def cache_info():
+    """lru_cache statistics of every fragment renderer, by name"""
+    return {render.__name__: render.cache_info() for render in
+            (render_result, render_score_card, render_first_innings, render_extras, render_cooldown,
+             render_ball_by_ball, render_stats)}
+
+
+class FragmentSlots:
+    """One placeholder per fragment; a fragment is sent only when its content changes"""
+
+    def __init__(self, names, make_placeholder):
+        self._slots = {name: make_placeholder() for name in names}
+        self._sent = {}  # Name -> content last sent to this viewer
+        self.sent = 0
+        self.skipped = 0
+
+    def update(self, name, content, draw):
+        """Call draw(placeholder, content) unless `content` is what the placeholder already shows"""
+        last = self._sent.get(name, self)  # self: nothing sent yet
+        # Memoized renders return the same object for the same inputs, so `is` usually decides
+        if last is content or last == content:
+            self.skipped += 1
+            return False
+        draw(self._slots[name], content)
+        self._sent[name] = content
+        self.sent += 1
+        return True
+
+    def html(self, name, html):
+        """Show an HTML fragment; an empty string clears the placeholder"""
+        return self.update(name, html, _draw_html)
+
+
+def _draw_html(placeholder, html):
+    if html:
+        placeholder.markdown(html, unsafe_allow_html=True)
+    else:
+        placeholder.empty()
+
+
+def _draw_ball_by_ball(placeholder, content):
+    if content is None:
+        placeholder.empty()
+        return
+    strip, caption = content
+    box = placeholder.container()
+    box.markdown("### 📝 Ball by Ball")
+    box.code(strip, language=None)
+    box.caption(caption)
+
+
+def _draw_stats(placeholder, content):
+    if content is None:
+        placeholder.empty()
+        return
+    summary, caption = content
+    box = placeholder.container()
+    box.markdown(summary)
+    box.caption(caption)
+
+
+def update_scoreboard(slots, score, stats, batting_first, bowling_first, match_overs):
+    """Bring the SCOREBOARD_FRAGMENTS slots up to date with a get_score() tuple and its MatchStats"""
+    (runs, wickets, overs, balls, last_action, ball_by_ball, cooldown_remaining,
+     extras, wides, noballs, byes, legbyes, free_hit, innings, first_innings_score,
+     match_complete, winner) = score
+
+    # Main score display
+    if match_complete:
+        if winner == "chasing_team":
+            winner_team = bowling_first if innings == 2 else batting_first
+        elif winner == "defending_team":
+            winner_team = batting_first if innings == 2 else bowling_first
+        else:  # tie
+            winner_team = None
+        slots.html("score", render_result(winner, winner_team, runs, wickets, overs, balls,
+                                          first_innings_score, last_action))
+    elif innings == 2:
+        slots.html("score", render_score_card(bowling_first, innings, runs, wickets, overs, balls, match_overs,
+                                              last_action, free_hit, stats.target, stats.need, stats.balls_left,
+                                              stats.required_rate))
+    else:
+        slots.html("score", render_score_card(batting_first, innings, runs, wickets, overs, balls, match_overs,
+                                              last_action, free_hit))
+
+    # First innings score during the chase
+    if innings == 2 and not match_complete:
+        slots.html("first_innings", render_first_innings(batting_first, first_innings_score))
+    else:
+        slots.html("first_innings", "")
+
+    slots.html("extras", render_extras(extras, wides, noballs, byes, legbyes))
+    slots.html("cooldown", render_cooldown(round(cooldown_remaining, 1), free_hit))
+
+    # Last 18 balls (3 overs)
+    if ball_by_ball:
+        slots.update("ball_by_ball", render_ball_by_ball(ball_by_ball[-18:], len(ball_by_ball), balls + overs * 6),
+                     _draw_ball_by_ball)
+    else:
+        slots.update("ball_by_ball", None, _draw_ball_by_ball)
+
+    if balls > 0 or overs > 0:
+        over_runs = stats.over_runs + ((stats.this_over,) if balls or stats.this_over else ())
+        slots.update("stats", render_stats(stats.run_rate, stats.projected_score, stats.partnership_runs,
+                                           stats.partnership_balls, stats.fours, stats.sixes, stats.dot_balls,
+                                           stats.dot_percent, over_runs), _draw_stats)
+    else:
+        slots.update("stats", None, _draw_stats)
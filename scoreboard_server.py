@@ -0,0 +1,227 @@
+# scoreboard_server.py
+"""Headless scoreboard feed for stadium screens and commentary laptops.
+
+    GET /score?match=<id>   current score as JSON
+    GET /ws?match=<id>      WebSocket: full score on connect, then only the
+                            fields that changed after each update/undo/reset
+
+Plain asyncio and the standard library. It reads the in-process score
+registry, so it runs inside the process that scores (start_in_background,
+e.g. main_app.py with SCOREBOARD_PORT set); a separate process would only
+see its own empty matches. Each change is serialized and framed once and
+the same bytes are written to every subscriber of that match.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+from score_state import DEFAULT_MATCH_ID, get_engine, registry
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_BUFFERED = 256 * 1024  # Drop subscribers whose socket backlog grows past this
+MAX_FRAME = 64 * 1024  # Largest client frame payload accepted; clients only send pings and closes
+
+
+class FrameTooLarge(ValueError):
+    """A client frame declared a payload longer than MAX_FRAME"""
+
+
+def score_to_dict(snapshot, version):
+    """JSON-friendly view of a ScoreSnapshot"""
+    score = snapshot._asdict()
+    score["ball_by_ball"] = list(snapshot.ball_by_ball)
+    score["stats"] = snapshot.stats._asdict()
+    score["stats"]["over_runs"] = list(snapshot.stats.over_runs)
+    score["overs"] = f"{snapshot.balls // 6}.{snapshot.balls % 6}"
+    score["version"] = version
+    return score
+
+
+def encode_frame(payload, opcode=0x1):
+    """Encode one unmasked server-to-client WebSocket frame"""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def read_frame(reader):
+    """Read one client frame; returns (opcode, payload). Raises FrameTooLarge past MAX_FRAME"""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    if length > MAX_FRAME:
+        raise FrameTooLarge(length)
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return first & 0x0F, payload
+
+
+class ScoreboardServer:
+    def __init__(self, host="0.0.0.0", port=8765):
+        self.host = host
+        self.port = port
+        self.loop = None
+        self.server = None
+        self.subscribers = {}  # match_id -> set of StreamWriter
+        self.latest = {}  # match_id -> last score dict sent
+        self.listeners = {}  # match_id -> engine listener callback
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        print(f"Scoreboard feed listening on http://{self.host}:{self.port}")
+
+    async def handle(self, reader, writer):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+
+        lines = request.decode("latin-1").split("\r\n")
+        request_line = lines[0].split(" ")
+        if len(request_line) != 3 or not request_line[2].startswith("HTTP/"):
+            self.respond(writer, "400 Bad Request", b"Bad request\n", "text/plain")
+            await writer.drain()
+            writer.close()
+            return
+        method, target, _ = request_line
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        url = urlsplit(target)
+        match_id = parse_qs(url.query).get("match", [DEFAULT_MATCH_ID])[0]
+
+        if match_id not in registry:
+            self.respond(writer, "404 Not Found", b"Unknown match\n", "text/plain")
+        elif method == "GET" and url.path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+            await self.handle_websocket(reader, writer, headers, match_id)
+            return
+        elif method == "GET" and url.path == "/score":
+            engine = get_engine(match_id)
+            body = json.dumps(score_to_dict(engine.snapshot(), engine.version())).encode("utf-8")
+            self.respond(writer, "200 OK", body, "application/json")
+        else:
+            self.respond(writer, "404 Not Found", b"Not found\n", "text/plain")
+        await writer.drain()
+        writer.close()
+
+    def respond(self, writer, status, body, content_type):
+        writer.write((f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                      f"Content-Length: {len(body)}\r\nAccess-Control-Allow-Origin: *\r\n"
+                      f"Connection: close\r\n\r\n").encode("latin-1") + body)
+
+    async def handle_websocket(self, reader, writer, headers, match_id):
+        key = headers.get("sec-websocket-key", "")
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                      f"Connection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+
+        self.subscribe(match_id, writer)
+        writer.write(encode_frame(json.dumps({"type": "score", "score": self.latest[match_id]})))
+        try:
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == 0x8:  # Close
+                    writer.write(encode_frame(payload, opcode=0x8))
+                    break
+                if opcode == 0x9:  # Ping
+                    writer.write(encode_frame(payload, opcode=0xA))
+        except FrameTooLarge:
+            writer.write(encode_frame(struct.pack("!H", 1009), opcode=0x8))  # 1009: message too big
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.unsubscribe(match_id, writer)
+            writer.close()
+
+    def subscribe(self, match_id, writer):
+        subscribers = self.subscribers.setdefault(match_id, set())
+        subscribers.add(writer)
+        if match_id not in self.listeners:
+            engine = get_engine(match_id)
+            self.latest[match_id] = score_to_dict(engine.snapshot(), engine.version())
+
+            def on_change(version, snapshot):
+                # Called on the scoring thread; hand off to the event loop
+                self.loop.call_soon_threadsafe(self.broadcast, match_id, version, snapshot)
+
+            self.listeners[match_id] = on_change
+            engine.add_listener(on_change)
+
+    def unsubscribe(self, match_id, writer):
+        subscribers = self.subscribers.get(match_id)
+        if subscribers is None:
+            return
+        subscribers.discard(writer)
+        if not subscribers:
+            del self.subscribers[match_id]
+            self.latest.pop(match_id, None)
+            get_engine(match_id).remove_listener(self.listeners.pop(match_id))
+
+    def broadcast(self, match_id, version, snapshot):
+        """Send the changed fields of a new snapshot to every subscriber of the match"""
+        subscribers = self.subscribers.get(match_id)
+        previous = self.latest.get(match_id)
+        if not subscribers or previous is None or version <= previous["version"]:
+            return
+        score = score_to_dict(snapshot, version)
+        changes = {key: value for key, value in score.items() if previous.get(key) != value}
+        self.latest[match_id] = score
+
+        frame = encode_frame(json.dumps({"type": "delta", "version": version, "changes": changes}))
+        for writer in list(subscribers):
+            transport = writer.transport
+            if transport.is_closing() or transport.get_write_buffer_size() > MAX_BUFFERED:
+                subscribers.discard(writer)  # Too slow or gone; it can reconnect for a full score
+                writer.close()
+            else:
+                writer.write(frame)
+
+
+_background = None
+_background_lock = threading.Lock()
+
+
+def start_in_background(host="0.0.0.0", port=8765):
+    """Run the feed on a daemon thread inside the current process (idempotent)"""
+    global _background
+    with _background_lock:
+        if _background is not None:
+            return _background
+        server = ScoreboardServer(host, port)
+        started = threading.Event()
+
+        def run():
+            async def main():
+                await server.start()
+                started.set()
+                async with server.server:
+                    await server.server.serve_forever()
+            asyncio.run(main())
+
+        threading.Thread(target=run, name="scoreboard-feed", daemon=True).start()
+        started.wait(5)
+        _background = server
+        return server
+
@@ -0,0 +1,167 @@
+# train_gesture_model.py
+"""Train the learned gesture classifier in gesture_model.py.
+
+Usage:
+    python train_gesture_model.py [fixture.npz ...] [--eval fixture.npz ...]
+                                  [--output models/gesture_mlp_v2.npz] [--samples 2000]
+                                  [--hidden 32] [--epochs 60] [--seed 0]
+
+Training data is the signal poses of gesture_poses.py plus its no-signal
+hands for the "none" class, each drawn at a random hand shape (finger
+spread and length) and with random tilt, size, position, handedness and
+landmark noise, plus the labelled frames of any fixtures given. Accuracy
+is reported on held-out hands: hand shapes drawn from a separate seed,
+never seen in training, and the labelled frames of every --eval fixture
+(for example sessions from benchmarks/record_landmarks.py). A fixture
+frame is labelled when it lies inside an event span, or, for fixtures
+without spans, in the --hold seconds before an event. Plain NumPy, a few
+seconds on one core.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from gesture_model import CLASSES, DEFAULT_MODEL, MODEL_VERSION, NONE_CLASS, GestureModel, landmark_features
+from gesture_poses import NONE_SHAPES, SHAPES, hand, rotate
+from landmark_classifier import GESTURE_LABELS, NO_GESTURE, classify_batch
+
+SHAPES_PER_CLASS = 50  # Hand shapes drawn for each class; augmented copies are spread over them
+
+
+def augment(rng, points):
+    """One randomly tilted, scaled, mirrored, moved and jittered copy of a hand"""
+    points = rotate(points, rng.uniform(-40.0, 40.0))
+    wrist = points[0]
+    points = (points - wrist) * rng.uniform(0.6, 1.4) + wrist  # Nearer or further from the camera
+    if rng.random() < 0.5:
+        points[:, 0] = 2 * wrist[0] - points[:, 0]  # The other hand
+    points[:, :2] += rng.uniform(-0.2, 0.2, size=2)
+    points += rng.normal(0, rng.uniform(0.002, 0.012), size=points.shape)
+    return points
+
+
+def synthetic_hands(rng, samples):
+    """`samples` augmented hands per class, at random hand shapes; returns (points, class indices)"""
+    shapes = {label: [shape] for label, shape in SHAPES.items()}
+    shapes[NONE_CLASS] = NONE_SHAPES
+    points, labels = [], []
+    for label, choices in shapes.items():
+        poses = [hand(*choices[rng.integers(len(choices))], spread=rng.uniform(0.8, 1.25),
+                      length=rng.uniform(0.8, 1.2)) for _ in range(SHAPES_PER_CLASS)]
+        for i in range(samples):
+            points.append(augment(rng, poses[i % len(poses)]))
+            labels.append(CLASSES.index(label))
+    return np.array(points, dtype=np.float32), np.array(labels)
+
+
+def fixture_hands(path, hold):
+    """Labelled hand frames of one replay fixture; returns (points, class indices)"""
+    data = np.load(path)
+    times, present = data["timestamps"], data["present"]
+    if "event_spans" in data.files:
+        spans = data["event_spans"]
+    else:
+        spans = np.stack([data["event_times"] - hold, data["event_times"]], axis=1)
+    points, labels = [], []
+    for (start, end), label in zip(spans, data["event_labels"]):
+        frames = np.flatnonzero(present & (times >= start) & (times <= end))
+        points.append(data["landmarks"][frames].astype(np.float32))
+        labels.append(np.full(len(frames), CLASSES.index(str(label))))
+    return np.concatenate(points), np.concatenate(labels)
+
+
+def train(features, labels, hidden, epochs, rng, batch=256, rate=0.01, decay=1e-4):
+    """Fit a one-hidden-layer MLP with softmax cross-entropy and Adam; returns a GestureModel"""
+    mean = features.mean(axis=0)
+    std = features.std(axis=0) + 1e-6
+    x = (features - mean) / std
+    params = [rng.normal(0, np.sqrt(2.0 / x.shape[1]), (x.shape[1], hidden)), np.zeros(hidden),
+              rng.normal(0, np.sqrt(2.0 / hidden), (hidden, len(CLASSES))), np.zeros(len(CLASSES))]
+    moments = [np.zeros_like(p) for p in params]
+    velocities = [np.zeros_like(p) for p in params]
+    step = 0
+    for epoch in range(epochs):
+        order = rng.permutation(len(x))
+        for i in range(0, len(x), batch):
+            xb, yb = x[order[i:i + batch]], labels[order[i:i + batch]]
+            w1, b1, w2, b2 = params
+            pre = xb @ w1 + b1
+            hidden_out = np.maximum(pre, 0.0)
+            logits = hidden_out @ w2 + b2
+            logits -= logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            probs[np.arange(len(yb)), yb] -= 1.0
+            grad_logits = probs / len(yb)
+            grad_hidden = grad_logits @ w2.T * (pre > 0)
+            grads = [xb.T @ grad_hidden + decay * w1, grad_hidden.sum(axis=0),
+                     hidden_out.T @ grad_logits + decay * w2, grad_logits.sum(axis=0)]
+            step += 1
+            for p, g, m, v in zip(params, grads, moments, velocities):
+                m *= 0.9
+                m += 0.1 * g
+                v *= 0.999
+                v += 0.001 * g * g
+                p -= rate * (m / (1 - 0.9 ** step)) / (np.sqrt(v / (1 - 0.999 ** step)) + 1e-8)
+    w1, b1, w2, b2 = (p.astype(np.float32) for p in params)
+    return GestureModel(w1, b1, w2, b2, mean.astype(np.float32), std.astype(np.float32))
+
+
+def class_indices(codes, fingers):
+    """classify_batch output as indices into CLASSES; a rejected hand is the "none" class"""
+    names = [GESTURE_LABELS[c] if c != NO_GESTURE else str(f) if f >= 0 else NONE_CLASS
+             for c, f in zip(codes, fingers)]
+    return np.array([CLASSES.index(name) for name in names])
+
+
+def report(name, model, points, labels):
+    """Print the model's and the rules' accuracy on labelled hands"""
+    predicted = class_indices(*model.classify_batch(points))
+    rules = class_indices(*classify_batch(points))
+    signals = labels != CLASSES.index(NONE_CLASS)
+    line = (f"{name:24s} {len(labels):6d} hands: model {np.mean(predicted == labels):.1%}, "
+            f"rules {np.mean(rules == labels):.1%}")
+    if not signals.all():
+        line += (f" | signals: model {np.mean(predicted[signals] == labels[signals]):.1%}, "
+                 f"rules {np.mean(rules[signals] == labels[signals]):.1%}"
+                 f" | none rejected: model {np.mean(predicted[~signals] == labels[~signals]):.1%}")
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fixtures", nargs="*", help="Labelled landmark fixtures to train on as well")
+    parser.add_argument("--eval", nargs="*", default=[], metavar="FIXTURE",
+                        help="Labelled landmark fixtures to evaluate on, never trained on")
+    parser.add_argument("--output", default=DEFAULT_MODEL)
+    parser.add_argument("--samples", type=int, default=2000, help="Augmented training hands per class")
+    parser.add_argument("--hold", type=float, default=2.0, help="Seconds before an event that are labelled")
+    parser.add_argument("--hidden", type=int, default=32)
+    parser.add_argument("--epochs", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    points, labels = synthetic_hands(rng, args.samples)
+    for path in args.fixtures:
+        fixture_points, fixture_labels = fixture_hands(path, args.hold)
+        points = np.concatenate([points, fixture_points])
+        labels = np.concatenate([labels, fixture_labels])
+        print(f"{path}: {len(fixture_labels)} labelled frames")
+    model = train(landmark_features(points), labels, args.hidden, args.epochs, rng)
+
+    report("train", model, points, labels)
+    # Hand shapes from another seed, so none of them was trained on
+    report("held-out hand shapes", model, *synthetic_hands(np.random.default_rng(args.seed + 1), args.samples // 4))
+    for path in args.eval:
+        report(os.path.basename(path), model, *fixture_hands(path, args.hold))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    model.save(args.output)
+    print(f"Saved model v{MODEL_VERSION} ({args.hidden} hidden units) to {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())